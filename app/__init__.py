@@ -1,10 +1,16 @@
 import os
+import importlib
+import threading
+import redis
 from flask import Flask
 from flask_sqlalchemy import SQLAlchemy
 from flask_migrate import Migrate
 from flask_jwt_extended import JWTManager
 from flask_socketio import SocketIO
+from flask_compress import Compress
 from celery import Celery
+from celery.signals import worker_process_init
+from sqlalchemy.pool import NullPool
 
 from config import config
 
@@ -13,7 +19,58 @@ db = SQLAlchemy()
 migrate = Migrate()
 jwt = JWTManager()
 socketio = SocketIO(cors_allowed_origins="*")
-celery = Celery(__name__)
+compress = Compress()
+# Make Celery work with Flask app context
+class FlaskCelery(Celery):
+    def __init__(self, *args, **kwargs):
+        super(FlaskCelery, self).__init__(*args, **kwargs)
+        self.app = None
+        
+    def init_app(self, app):
+        self.app = app
+        
+        class ContextTask(self.Task):
+            def __call__(self, *args, **kwargs):
+                with app.app_context():
+                    return self.run(*args, **kwargs)
+        
+        self.Task = ContextTask
+        
+        # Update Celery config
+        self.conf.update(
+            broker_url=app.config['CELERY_BROKER_URL'],
+            result_backend=app.config['CELERY_RESULT_BACKEND']
+        )
+
+celery = FlaskCelery(__name__, include=['app.tasks'])
+redis_client = redis.Redis.from_url(config.Config.REDIS_URL)
+
+# LLM/CV tasks run for seconds: acknowledge late, prefetch one task at a time
+# and keep them on their own queue so short tasks aren't stuck behind them.
+# Run LLM workers with: celery -A run.celery worker -Q career_llm -Ofair
+celery.conf.update(
+    task_acks_late=True,
+    task_reject_on_worker_lost=True,
+    worker_prefetch_multiplier=1,
+    task_routes={
+        'app.tasks.generate_roadmap_task': {'queue': 'career_llm'}
+    },
+    # Run with: celery -A run.celery beat
+    beat_schedule={
+        'refresh-monthly-activity': {
+            'task': 'app.tasks.refresh_monthly_activity',
+            'schedule': 3600.0
+        }
+    },
+    # Compact messages: msgpack bodies, zstd-compressed, results kept for an hour
+    task_serializer='msgpack',
+    result_serializer='msgpack',
+    accept_content=['msgpack', 'json'],
+    result_accept_content=['msgpack', 'json'],
+    task_compression='zstd',
+    result_compression='zstd',
+    result_expires=3600
+)
 
 def create_app(config_name='default'):
     """Application factory function."""
@@ -22,53 +79,120 @@ def create_app(config_name='default'):
     # Load configuration
     app.config.from_object(config.config[config_name])
     
+    # Serialize JSON responses with orjson when it is installed
+    from app.utils.json_provider import OrjsonProvider, orjson
+    if orjson is not None:
+        app.json = OrjsonProvider(app)
+    
     # Ensure upload directory exists
     os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
     
+    # Green-thread servers would share pooled connections across greenlets,
+    # so leave pooling to the database side instead
+    if app.config.get('SOCKETIO_ASYNC_MODE') in ('eventlet', 'gevent'):
+        app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {'poolclass': NullPool, 'pool_pre_ping': True}
+    
+    # psycopg2 blocks the whole green-thread hub while it waits on PostgreSQL;
+    # patch it to yield so one worker keeps serving other requests during queries
+    if app.config.get('SOCKETIO_ASYNC_MODE') == 'eventlet':
+        from eventlet.support.psycopg2_patcher import make_psycopg_green
+        make_psycopg_green()
+    elif app.config.get('SOCKETIO_ASYNC_MODE') == 'gevent':
+        try:
+            from psycogreen.gevent import patch_psycopg
+            patch_psycopg()
+        except ImportError:
+            app.logger.warning("gevent mode without psycogreen: database waits will block the worker")
+    
     # Initialize extensions with app
     print("Initializing database...")
     db.init_app(app)
     migrate.init_app(app, db)
     jwt.init_app(app)
-    socketio.init_app(app)
-    
-    # Configure Celery
-    celery.conf.update(app.config)
-    
-    # Register blueprints
-    from app.routes.auth import auth_bp as auth_blueprint
-    app.register_blueprint(auth_blueprint, url_prefix='/api/auth')
-    
-    from app.routes.user import user as user_blueprint
-    app.register_blueprint(user_blueprint, url_prefix='/api/user')
-    
-    from app.routes.entreprise import enterprise_bp as enterprise_blueprint
-    app.register_blueprint(enterprise_blueprint, url_prefix='/api/enterprise')
-    
-    from app.routes.interview import interview_bp as interview_blueprint
-    app.register_blueprint(interview_blueprint, url_prefix='/api/interview')
+    compress.init_app(app)
+    socketio.init_app(app, async_mode=app.config.get('SOCKETIO_ASYNC_MODE'),
+                      message_queue=app.config.get('SOCKETIO_MESSAGE_QUEUE'))
     
-    from app.routes.dashboard import dashboard as dashboard_blueprint
-    app.register_blueprint(dashboard_blueprint, url_prefix='/api/dashboard')
-    from app.routes.job import job_bp as job_blueprint
-    app.register_blueprint(job_blueprint, url_prefix='/api/job')
+    # Configure Celery (tasks run inside this app's context)
+    celery.init_app(app)
     
-    from app.routes.careur import career_bp as career_blueprint
-    app.register_blueprint(career_blueprint, url_prefix='/api/career')
+    @worker_process_init.connect(weak=False)
+    def dispose_db_engine(**kwargs):
+        """Drop connections inherited from the parent when a worker forks."""
+        with app.app_context():
+            db.engine.dispose(close=False)
     
-    # Register main blueprint for home routes
-    from app.routes.main import main_bp as main_blueprint
-    app.register_blueprint(main_blueprint)
+    # Register blueprints (on first request when LAZY_BLUEPRINTS is set)
+    if app.config.get('LAZY_BLUEPRINTS', False):
+        app.wsgi_app = LazyBlueprintLoader(app, app.wsgi_app)
+    else:
+        register_blueprints(app)
 
     # Register error handlers
     register_error_handlers(app)
     
+    # N+1 query detection in development
+    if app.config.get('NPLUSONE_ENABLED', False):
+        try:
+            from nplusone.ext.flask_sqlalchemy import NPlusOne
+            NPlusOne(app)
+        except ImportError:
+            app.logger.warning("NPLUSONE_ENABLED is set but nplusone is not installed")
+    
+    # Per-request profiling, only when explicitly enabled
+    if app.config.get('PROFILE', False):
+        from app.utils.profiling import init_profiler
+        init_profiler(app)
+    
     # Initialize Socket.IO events
     import app.sockets.interview_socket as sockets
     sockets.InterviewSocketNamespace(socketio)
     
     return app
 
+# Blueprints as (import path, url prefix); imported on demand by register_blueprints
+BLUEPRINTS = (
+    ('app.routes.auth:auth_bp', '/api/auth'),
+    ('app.routes.user:user', '/api/user'),
+    ('app.routes.entreprise:enterprise_bp', '/api/enterprise'),
+    ('app.routes.interview:interview_bp', '/api/interview'),
+    ('app.routes.dashboard:dashboard', '/api/dashboard'),
+    ('app.routes.job:job_bp', '/api/job'),
+    ('app.routes.careur:career_bp', '/api/career'),
+    # Main blueprint for home routes
+    ('app.routes.main:main_bp', None),
+)
+
+def register_blueprints(app):
+    """Import and register every blueprint listed in BLUEPRINTS."""
+    for import_path, url_prefix in BLUEPRINTS:
+        module_name, attr = import_path.split(':')
+        blueprint = getattr(importlib.import_module(module_name), attr)
+        app.register_blueprint(blueprint, url_prefix=url_prefix)
+
+class LazyBlueprintLoader:
+    """
+    WSGI wrapper that defers blueprint imports until the first request.
+    
+    Flask refuses new routes once it has handled a request, so every
+    blueprint is registered together, just before the first dispatch.
+    App creation for CLI commands, workers and tests skips the route
+    modules and their service dependencies entirely.
+    """
+    def __init__(self, app, wsgi_app):
+        self.app = app
+        self.wsgi_app = wsgi_app
+        self.loaded = False
+        self.lock = threading.Lock()
+        
+    def __call__(self, environ, start_response):
+        if not self.loaded:
+            with self.lock:
+                if not self.loaded:
+                    register_blueprints(self.app)
+                    self.loaded = True
+        return self.wsgi_app(environ, start_response)
+
 def register_error_handlers(app):
     """Register error handlers for the application."""
     @app.errorhandler(404)
@@ -82,26 +206,3 @@ def register_error_handlers(app):
     @app.errorhandler(500)
     def internal_server_error(error):
         return {"error": "Internal Server Error"}, 500
-
-# Make Celery work with Flask app context
-class FlaskCelery(Celery):
-    def __init__(self, *args, **kwargs):
-        super(FlaskCelery, self).__init__(*args, **kwargs)
-        self.app = None
-        
-    def init_app(self, app):
-        self.app = app
-        self.conf.update(app.config)
-        
-        class ContextTask(self.Task):
-            def __call__(self, *args, **kwargs):
-                with app.app_context():
-                    return self.run(*args, **kwargs)
-        
-        self.Task = ContextTask
-        
-        # Update Celery config
-        self.conf.update(
-            broker_url=app.config['CELERY_BROKER_URL'],
-            result_backend=app.config['CELERY_RESULT_BACKEND']
-        )
\ No newline at end of file
@@ -1,35 +1,61 @@
 from datetime import datetime
-from sqlalchemy.dialects.postgresql import JSON
+from flask import url_for
+from sqlalchemy import event, update, DDL
+from sqlalchemy.dialects.postgresql import JSON, JSONB, TSVECTOR
 from flask_sqlalchemy import SQLAlchemy
-from werkzeug.security import generate_password_hash, check_password_hash
+from sqlalchemy.orm import deferred, validates
+from app.utils.security import hash_password, verify_password
+from app.utils.skills import normalize_skills
 from app import db
 
 userIdStr = 'users.id'
 
+# Trigram indexes (ix_enterprises_name_trgm) need pg_trgm before the tables are created
+event.listen(db.metadata, 'before_create', DDL('CREATE EXTENSION IF NOT EXISTS pg_trgm'))
+# Naive UTC like the datetime.utcnow defaults, but taken from the database clock
+utcNowSql = db.text("(now() at time zone 'utc')")
+
 class User(db.Model):
     """User model for job seekers."""
     __tablename__ = 'users'
+    __table_args__ = (
+        # Candidate skill filters (profile_data -> 'skills' @> [...])
+        db.Index('ix_users_profile_skills', db.text("(profile_data -> 'skills') jsonb_path_ops"),
+                 postgresql_using='gin'),
+        # Only invited candidates may lack a password
+        db.CheckConstraint('password_hash IS NOT NULL OR is_temp_account', name='ck_users_password_or_temp'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(100), nullable=False)
     email = db.Column(db.String(120), unique=True, nullable=False, index=True)
-    password_hash = db.Column(db.String(256), nullable=False)
+    password_hash = db.Column(db.String(256), nullable=True)  # Unset for invited candidates until they choose one
     role = db.Column(db.String(20), default='user', nullable=False)  # 'user', 'admin'
+    is_active = db.Column(db.Boolean, default=True, server_default=db.true(), nullable=False)
+    is_temp_account = db.Column(db.Boolean, default=False, server_default=db.false(), nullable=False)  # Created by an interview invitation
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
-    profile_data = db.Column(JSON, nullable=True)  # Stores skills, experience, education, etc.
+    profile_data = db.Column(JSONB, nullable=True)  # Stores skills, experience, education, etc.
+    cv_path = db.Column(db.String(255), nullable=True)  # Path to the latest uploaded CV
+    cv_present = db.Column(db.Boolean, default=False, nullable=False)  # Set on CV upload, read instead of stat-ing cv_path
+    cached_skills = db.Column(JSONB, nullable=True)  # Skills parsed from the CV, valid while the hash below matches it
+    cached_skills_cv_hash = db.Column(db.String(64), nullable=True)  # sha256 of the CV cached_skills came from
     
     # Relationships
-    interviews = db.relationship('Interview', backref='user', lazy='dynamic')
-    applications = db.relationship('Application', backref='user', lazy='dynamic')
-    career_roadmaps = db.relationship('CareerRoadmap', backref='user', lazy='dynamic')
-    notifications = db.relationship('Notification', backref='user', lazy='dynamic')
+    interviews = db.relationship('Interview', back_populates='user', lazy='select')
+    applications = db.relationship('Application', back_populates='user', lazy='select')
+    career_roadmaps = db.relationship('CareerRoadmap', back_populates='user', lazy='selectin')
+    notifications = db.relationship('Notification', back_populates='user', lazy='select')
     
     def set_password(self, password):
-        self.password_hash = generate_password_hash(password)
+        self.password_hash = hash_password(password)
         
     def check_password(self, password):
-        return check_password_hash(self.password_hash, password)
+        # Upgrade legacy or outdated hashes; persisted with the caller's next commit
+        valid, new_hash = verify_password(self.password_hash, password)
+        if new_hash:
+            self.password_hash = new_hash
+        return valid
     
     def __repr__(self):
         return f'<User {self.name}>'
@@ -42,19 +68,25 @@ class TeamMember(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(100), nullable=False)
     email = db.Column(db.String(120), unique=True, nullable=False, index=True)
-    password_hash = db.Column(db.String(256), nullable=False)
+    password_hash = db.Column(db.String(256), nullable=True)  # Unset until the invitation is accepted
+    invitation_token = db.Column(db.String(64), unique=True, nullable=True, index=True)  # Cleared once a password is set
     role = db.Column(db.String(20), default='member', nullable=False)  # 'member', 'admin'
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     # Relationships
     enterprise_id = db.Column(db.Integer, db.ForeignKey('enterprises.id'), nullable=False)
+    enterprise = db.relationship('Enterprise', back_populates='team_members')
     
     def set_password(self, password):
-        self.password_hash = generate_password_hash(password)
+        self.password_hash = hash_password(password)
         
     def check_password(self, password):
-        return check_password_hash(self.password_hash, password)
+        # Upgrade legacy or outdated hashes; persisted with the caller's next commit
+        valid, new_hash = verify_password(self.password_hash, password)
+        if new_hash:
+            self.password_hash = new_hash
+        return valid
     
     def __repr__(self):
         return f'<TeamMember {self.name}>'
@@ -63,6 +95,11 @@ class TeamMember(db.Model):
 class Enterprise(db.Model):
     """Enterprise model for companies using the platform."""
     __tablename__ = 'enterprises'
+    __table_args__ = (
+        # Substring name search (ILIKE '%...%'), needs the pg_trgm extension
+        db.Index('ix_enterprises_name_trgm', 'name', postgresql_using='gin',
+                 postgresql_ops={'name': 'gin_trgm_ops'}),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(100), nullable=False)
@@ -75,16 +112,22 @@ class Enterprise(db.Model):
     size = db.Column(db.String(50), nullable=True)  # e.g., "1-10", "11-50", "51-200", "201-500", "501+"
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
-    custom_settings = db.Column(JSON, nullable=True)  # Custom interview settings, preferences
+    custom_settings = db.Column(JSONB, nullable=True)  # Custom interview settings, preferences
     
     # Relationships
-    jobs = db.relationship('Job', backref='enterprise', lazy='dynamic')
+    jobs = db.relationship('Job', back_populates='enterprise', lazy='select')
+    # Not eager by default: most enterprise loads never touch members; use selectinload() where they do
+    team_members = db.relationship('TeamMember', back_populates='enterprise', lazy='select')
     
     def set_password(self, password):
-        self.password_hash = generate_password_hash(password)
+        self.password_hash = hash_password(password)
         
     def check_password(self, password):
-        return check_password_hash(self.password_hash, password)
+        # Upgrade legacy or outdated hashes; persisted with the caller's next commit
+        valid, new_hash = verify_password(self.password_hash, password)
+        if new_hash:
+            self.password_hash = new_hash
+        return valid
     
     def __repr__(self):
         return f'<Enterprise {self.name}>'
@@ -93,6 +136,21 @@ class Enterprise(db.Model):
 class Job(db.Model):
     """Job postings created by enterprises."""
     __tablename__ = 'jobs'
+    __table_args__ = (
+        # Active/filtered job lists per enterprise
+        db.Index('ix_jobs_enterprise_status', 'enterprise_id', 'status'),
+        # Index-only scans for per-enterprise job lists that show titles (analytics)
+        db.Index('ix_jobs_enterprise_id_title', 'enterprise_id', 'id', postgresql_include=['title']),
+        # Most applied to jobs per enterprise
+        db.Index('ix_jobs_enterprise_application_count', 'enterprise_id', db.desc('application_count')),
+        # Newest jobs per enterprise (enterprise job pages, dashboard time filters)
+        db.Index('ix_jobs_enterprise_created', 'enterprise_id', db.desc('created_at')),
+        # Public job list: active jobs newest first, paged by (created_at, id) keyset
+        db.Index('ix_jobs_active_created_id', db.desc('created_at'), db.desc('id'),
+                 postgresql_where=db.text("status = 'active'")),
+        # Keyword search over title, description and skills
+        db.Index('ix_jobs_search_tsv', 'search_tsv', postgresql_using='gin'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(200), nullable=False)
@@ -108,10 +166,26 @@ class Job(db.Model):
     status = db.Column(db.String(20), default='active')  # 'active', 'closed', 'draft', 'archived'
     enterprise_id = db.Column(db.Integer, db.ForeignKey('enterprises.id'), nullable=False)
     interview_settings = db.Column(JSON, nullable=True)  # Required questions, personality traits, etc.
+    skills_required = db.Column(db.Text, nullable=True)  # As entered by the enterprise
+    skills_required_tokens = db.Column(JSONB, nullable=True)  # normalize_skills(skills_required), kept in sync on write
+    # Full-text document maintained by Postgres; only used in WHERE clauses, so never loaded
+    search_tsv = deferred(db.Column(TSVECTOR, db.Computed(
+        "to_tsvector('english', coalesce(title, '') || ' ' || coalesce(description, '')"
+        " || ' ' || coalesce(skills_required, ''))",
+        persisted=True
+    )))
+    application_count = db.Column(db.Integer, default=0, server_default='0', nullable=False)  # Kept in sync by Application events
     
     # Relationships
-    applications = db.relationship('Application', backref='job', lazy='dynamic')
-    interviews = db.relationship('Interview', backref='job', lazy='dynamic')
+    enterprise = db.relationship('Enterprise', back_populates='jobs')
+    applications = db.relationship('Application', back_populates='job', lazy='select')
+    interviews = db.relationship('Interview', back_populates='job', lazy='select')
+    
+    @validates('skills_required')
+    def _tokenize_skills_required(self, key, value):
+        # Tokenized once per edit instead of on every match against a candidate
+        self.skills_required_tokens = normalize_skills(value)
+        return value
     
     def __repr__(self):
         return f'<Job {self.title} by {self.enterprise.name}>'
@@ -120,26 +194,71 @@ class Job(db.Model):
 class Application(db.Model):
     """Job applications submitted by users."""
     __tablename__ = 'applications'
+    __table_args__ = (
+        # One application per user and job; serves the "already applied" checks
+        db.Index('ix_applications_user_job', 'user_id', 'job_id', unique=True),
+        # Recent applications per user
+        db.Index('ix_applications_user_created', 'user_id', db.desc('created_at')),
+        # Per-job application counts and newest-first application lists per job
+        db.Index('ix_applications_job_created', 'job_id', db.desc('created_at')),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey(userIdStr), nullable=False)
     job_id = db.Column(db.Integer, db.ForeignKey('jobs.id'), nullable=False)
     cv_path = db.Column(db.String(255), nullable=True)  # Path to CV file
-    cover_letter = db.Column(db.Text, nullable=True)
+    cover_letter = deferred(db.Column(db.Text, nullable=True))  # Loaded on access
     status = db.Column(db.String(20), default='pending')  # 'pending', 'rejected', 'interview_scheduled', 'accepted'
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    created_at = db.Column(db.DateTime, server_default=utcNowSql)  # Filled in by the database
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
+    # Job interview invitation; the token alone identifies the application
+    interview_token = db.Column(db.String(64), unique=True, nullable=True, index=True)
+    interview_scheduled_at = db.Column(db.DateTime(timezone=True), nullable=True)
+    interview_token_expiry = db.Column(db.DateTime(timezone=True), nullable=True)
+    
     # Additional data like extracted skills, etc.
     application_data = db.Column(JSON, nullable=True)
     
+    # Relationships
+    user = db.relationship('User', back_populates='applications')
+    job = db.relationship('Job', back_populates='applications')
+    
     def __repr__(self):
         return f'<Application {self.id} by User {self.user_id} for Job {self.job_id}>'
 
 
+def _bump_application_count(connection, job_id, delta):
+    # Pin updated_at so its onupdate default does not fire: applications are not edits of the job
+    connection.execute(
+        update(Job)
+        .where(Job.id == job_id)
+        .values(application_count=Job.application_count + delta, updated_at=Job.updated_at)
+    )
+
+
+@event.listens_for(Application, 'after_insert')
+def _count_new_application(mapper, connection, target):
+    _bump_application_count(connection, target.job_id, 1)
+
+
+@event.listens_for(Application, 'after_delete')
+def _count_deleted_application(mapper, connection, target):
+    _bump_application_count(connection, target.job_id, -1)
+
+
 class Interview(db.Model):
     """Interviews conducted on the platform."""
     __tablename__ = 'interviews'
+    __table_args__ = (
+        # Recent interviews per user
+        db.Index('ix_interviews_user_created', 'user_id', db.desc('created_at')),
+        # Top scores per job (top candidates, enterprise statistics)
+        db.Index('ix_interviews_job_score', 'job_id', db.desc('score'),
+                 postgresql_where=db.text('score IS NOT NULL')),
+        # Application -> interview join in the candidates list, index-only for the shown columns
+        db.Index('ix_interviews_user_job', 'user_id', 'job_id', postgresql_include=['score', 'created_at']),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey(userIdStr), nullable=False)
@@ -147,17 +266,21 @@ class Interview(db.Model):
     scheduled_time = db.Column(db.DateTime, nullable=True)
     start_time = db.Column(db.DateTime, nullable=True)
     end_time = db.Column(db.DateTime, nullable=True)
-    transcript = db.Column(db.Text, nullable=True)  # Full interview transcript
+    transcript = deferred(db.Column(db.Text, nullable=True))  # Full interview transcript (loaded on access)
     summary = db.Column(db.Text, nullable=True)  # AI-generated summary
     score = db.Column(db.Float, nullable=True)  # Overall score
     detailed_scores = db.Column(JSON, nullable=True)  # Breakdown of scores by category
     feedback = db.Column(db.Text, nullable=True)  # AI-generated feedback
+    additional_data = db.Column(JSONB, nullable=True)  # Assessment context (job_interest, additional_info), decoded on load
     interview_type = db.Column(db.String(20), default='general')  # 'general', 'job_specific'
     status = db.Column(db.String(20), default='scheduled')  # 'scheduled', 'in_progress', 'completed', 'cancelled'
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    created_at = db.Column(db.DateTime, server_default=utcNowSql)  # Filled in by the database
     
     # Relationships
-    questions = db.relationship('InterviewQuestion', backref='interview', lazy='dynamic')
+    user = db.relationship('User', back_populates='interviews')
+    job = db.relationship('Job', back_populates='interviews')
+    questions = db.relationship('InterviewQuestion', back_populates='interview', lazy='selectin',
+                                order_by='InterviewQuestion.created_at')
     
     def __repr__(self):
         interview_type = f" for {self.job.title}" if self.job else ""
@@ -174,7 +297,19 @@ class InterviewQuestion(db.Model):
     answer = db.Column(db.Text, nullable=True)
     score = db.Column(db.Float, nullable=True)  # Score for this specific question
     feedback = db.Column(db.Text, nullable=True)  # Feedback on this answer
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    is_must_ask = db.Column(db.Boolean, default=False, server_default='false', nullable=False)  # Set by the enterprise's interview settings
+    audio_key = db.Column(db.String(64), nullable=True)  # SHA-256 of voice and text naming the TTS file, when TTS is on
+    created_at = db.Column(db.DateTime, server_default=utcNowSql)  # Filled in by the database
+    
+    # Relationships
+    interview = db.relationship('Interview', back_populates='questions')
+    
+    @property
+    def audio_url(self):
+        # Streams while synthesizing, or serves the cached file once rendered
+        if not self.audio_key:
+            return None
+        return url_for('interview.stream_question_audio', question_id=self.id)
     
     def __repr__(self):
         return f'<InterviewQuestion {self.id} for Interview {self.interview_id}>'
@@ -183,6 +318,10 @@ class InterviewQuestion(db.Model):
 class CareerRoadmap(db.Model):
     """Career roadmaps generated for users."""
     __tablename__ = 'career_roadmaps'
+    __table_args__ = (
+        # Serves "latest roadmap for user" lookups as an index range scan
+        db.Index('ix_career_roadmaps_user_created', 'user_id', db.desc('created_at')),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey(userIdStr), nullable=False)
@@ -193,9 +332,15 @@ class CareerRoadmap(db.Model):
     recommended_roles = db.Column(JSON, nullable=True)  # Suitable job roles
     recommended_courses = db.Column(JSON, nullable=True)  # Courses to take
     timeline = db.Column(JSON, nullable=True)  # Timeline for skill development
+    current_role = db.Column(db.String(100), nullable=True)
+    target_role = db.Column(db.String(100), nullable=True)
+    progress = db.Column(JSONB, nullable=True)  # Progress on roadmap activities (JSONB so updates can merge in place)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
+    # Relationships
+    user = db.relationship('User', back_populates='career_roadmaps')
+    
     def __repr__(self):
         return f'<CareerRoadmap {self.id} for User {self.user_id}>'
 
@@ -212,5 +357,28 @@ class Notification(db.Model):
     related_id = db.Column(db.Integer, nullable=True)  # ID of related resource (interview, application, etc.)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
+    # Relationships
+    user = db.relationship('User', back_populates='notifications')
+    
+    def __repr__(self):
+        return f'<Notification {self.id} for User {self.user_id}>'
+
+
+class MonthlyActivity(db.Model):
+    """Monthly interview/application counts per user and per enterprise, rebuilt by a periodic task."""
+    __tablename__ = 'monthly_activity'
+    __table_args__ = (
+        db.Index('ix_monthly_activity_user_month', 'user_id', 'month'),
+        db.Index('ix_monthly_activity_enterprise_month', 'enterprise_id', 'month'),
+    )
+    
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey(userIdStr), nullable=True)  # Set for per-user rows
+    enterprise_id = db.Column(db.Integer, db.ForeignKey('enterprises.id'), nullable=True)  # Set for per-enterprise rows
+    month = db.Column(db.Date, nullable=False)  # First day of the month
+    interview_count = db.Column(db.Integer, default=0, nullable=False)
+    application_count = db.Column(db.Integer, default=0, nullable=False)
+    
     def __repr__(self):
-        return f'<Notification {self.id} for User {self.user_id}>'
\ No newline at end of file
+        owner = f"User {self.user_id}" if self.user_id else f"Enterprise {self.enterprise_id}"
+        return f'<MonthlyActivity {self.month} for {owner}>'
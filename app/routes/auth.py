@@ -1,8 +1,8 @@
 from flask import Blueprint, request, jsonify, current_app, render_template, url_for, redirect
 from flask_jwt_extended import (create_access_token, create_refresh_token, 
                                jwt_required, get_jwt_identity, get_jwt)
-from werkzeug.security import generate_password_hash, check_password_hash
 from app.models import User, Enterprise, db
+from app.utils.decorators import get_request_data
 from datetime import datetime, timedelta, timezone
 import uuid
 import os
@@ -40,7 +40,7 @@ def register():
     if request.method == 'GET':
         return render_template('auth/register.html')
     
-    data = request.form if request.form else request.get_json()
+    data = get_request_data()
     
     # Check if required fields are present
     required_fields = ['email', 'password', 'name', 'account_type']
@@ -56,14 +56,13 @@ def register():
     
     # Create user or enterprise based on account type
     if data['account_type'] == 'user':
-        password_hash = generate_password_hash(data['password'])
         new_user = User(
             email=data['email'],
-            password=password_hash,
             name=data['name'],
             created_at=datetime.now(timezone.utc),
             is_active=False  # User starts as inactive until email verification
         )
+        new_user.set_password(data['password'])
         db.session.add(new_user)
         db.session.commit()
         
@@ -74,14 +73,13 @@ def register():
         return jsonify({'message': 'User registered successfully. Please verify your email.'}), 201
     
     elif data['account_type'] == 'enterprise':
-        password_hash = generate_password_hash(data['password'])
         new_enterprise = Enterprise(
             email=data['email'],
-            password=password_hash,
             name=data['name'],
             created_at=datetime.now(timezone.utc),
             is_active=False  # Enterprise starts as inactive until email verification
         )
+        new_enterprise.set_password(data['password'])
         db.session.add(new_enterprise)
         db.session.commit()
         
@@ -120,14 +118,17 @@ def login():
     if request.method == 'GET':
         return render_template('auth/login.html')
     
-    data = request.form if request.form else request.get_json()
+    data = get_request_data()
     
     if not data or 'email' not in data or 'password' not in data:
         return jsonify({'error': 'Missing email or password'}), 400
     
     # Check if it's a user
     user = User.query.filter_by(email=data['email']).first()
-    if user and check_password_hash(user.password, data['password']):
+    if user and user.is_temp_account:
+        # Invited candidates have no password yet
+        return jsonify({'error': 'Please finish setting up your account before logging in'}), 401
+    if user and user.check_password(data['password']):
         if not user.is_active:
             return jsonify({'error': 'Please verify your email before logging in'}), 401
         
@@ -153,7 +154,7 @@ def login():
     
     # Check if it's an enterprise
     enterprise = Enterprise.query.filter_by(email=data['email']).first()
-    if enterprise and check_password_hash(enterprise.password, data['password']):
+    if enterprise and enterprise.check_password(data['password']):
         if not enterprise.is_active:
             return jsonify({'error': 'Please verify your email before logging in'}), 401
         
@@ -194,7 +195,7 @@ def forgot_password():
     if request.method == 'GET':
         return render_template('auth/forgot_password.html')
     
-    data = request.form if request.form else request.get_json()
+    data = get_request_data()
     
     if not data or 'email' not in data:
         return jsonify({'error': 'Email is required'}), 400
@@ -229,7 +230,7 @@ def reset_password(token):
     if request.method == 'GET':
         return render_template('auth/reset_password.html', token=token)
     
-    data = request.form if request.form else request.get_json()
+    data = get_request_data()
     
     if not data or 'password' not in data:
         return jsonify({'error': 'New password is required'}), 400
@@ -239,7 +240,7 @@ def reset_password(token):
     from datetime import timezone
 
     if user and user.reset_token_expiry > datetime.now(timezone.utc):
-        user.password = generate_password_hash(data['password'])
+        user.set_password(data['password'])
         user.reset_token = None
         user.reset_token_expiry = None
         db.session.commit()
@@ -248,7 +249,7 @@ def reset_password(token):
     # Check enterprise reset token
     enterprise = Enterprise.query.filter_by(reset_token=token).first()
     if enterprise and enterprise.reset_token_expiry > datetime.now(timezone.utc):
-        enterprise.password = generate_password_hash(data['password'])
+        enterprise.set_password(data['password'])
         enterprise.reset_token = None
         enterprise.reset_token_expiry = None
         db.session.commit()
@@ -270,10 +271,10 @@ def change_password():
         if not user:
             return jsonify({'error': 'User not found'}), 404
         
-        if not check_password_hash(user.password, data['current_password']):
+        if not user.check_password(data['current_password']):
             return jsonify({'error': 'Current password is incorrect'}), 401
         
-        user.password = generate_password_hash(data['new_password'])
+        user.set_password(data['new_password'])
         db.session.commit()
     
     elif identity['type'] == 'enterprise':
@@ -281,10 +282,10 @@ def change_password():
         if not enterprise:
             return jsonify({'error': 'Enterprise not found'}), 404
         
-        if not check_password_hash(enterprise.password, data['current_password']):
+        if not enterprise.check_password(data['current_password']):
             return jsonify({'error': 'Current password is incorrect'}), 401
         
-        enterprise.password = generate_password_hash(data['new_password'])
+        enterprise.set_password(data['new_password'])
         db.session.commit()
     
     return jsonify({'message': 'Password changed successfully'}), 200
\ No newline at end of file
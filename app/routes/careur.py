@@ -1,113 +1,166 @@
-from flask import Blueprint, request, jsonify, render_template, current_app, g
+from flask import Blueprint, request, jsonify, render_template, current_app, g, url_for
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from app.models import User, CareerRoadmap, db
-import app.services.gemini_service as gemini_service
-from app.utils.file_parser import parse_cv
-import os
-from dotenv import load_dotenv
-
-load_dotenv()
-
-gemini_service = gemini_service.GeminiService(api_key=os.getenv('GEMINI_API_KEY'))
+from app.services.gemini_service import get_gemini
+from app.utils.file_parser import parse_cv_cached
+from app.tasks import generate_roadmap_task
+from app.utils.decorators import cache_response, invalidate_cache, get_request_data
+from sqlalchemy import select, update, func, cast
+from sqlalchemy.dialects.postgresql import JSONB
+from operator import attrgetter
+from sqlalchemy.orm import selectinload, raiseload
 
 career_bp = Blueprint('career', __name__, url_prefix='/career')
 userNotFoundErrStr = "User not found"
 
+# Roadmap columns exposed by the API ('id' is sent as 'roadmap_id')
+ROADMAP_FIELDS = ('id', 'goals', 'recommended_skills', 'timeline', 'current_role', 'target_role', 'created_at')
+_ROADMAP_KEYS = ('roadmap_id',) + ROADMAP_FIELDS[1:]
+_roadmap_values = attrgetter(*ROADMAP_FIELDS)
+
+def serialize_roadmap(roadmap):
+    """Build the API representation of a roadmap"""
+    return dict(zip(_ROADMAP_KEYS, _roadmap_values(roadmap)))
+
+def _loader_options(*options):
+    """Add raiseload('*') in configs that want stray lazy loads to fail fast"""
+    if current_app.config.get('SQLALCHEMY_RAISELOAD', False):
+        options += (raiseload('*'),)
+    return options
+
+# Keyed on the integer user id so invalidate_roadmap_cache (called from tasks) hits the same key
+def _roadmap_cache_key():
+    """Per-user cache key for the latest roadmap"""
+    return f"career:roadmap:{get_jwt_identity()['id']}"
+
+def _courses_cache_key():
+    """Per-user cache key for the recommended courses"""
+    return f"career:courses:{get_jwt_identity()['id']}"
+
+def invalidate_roadmap_cache(user_id):
+    """Drop the cached roadmap responses after the user's roadmaps change"""
+    invalidate_cache(f"career:roadmap:{user_id}")
+    invalidate_cache(f"career:courses:{user_id}")
+
+def _user_cv_row(user_id):
+    """Fetch only the columns the career routes need from the user row"""
+    return db.session.execute(
+        select(User.id, User.cv_path, User.cv_present).where(User.id == user_id)
+    ).first()
+
+def _load_user_cv(user, default=None):
+    """Parse the user's CV if the DB says one was uploaded, without a separate exists() check"""
+    if not user.cv_present:
+        return default
+    try:
+        return parse_cv_cached(user.cv_path)
+    except FileNotFoundError:
+        return default
+
+def _latest_roadmap(user_id):
+    """Fetch the user's most recent roadmap in a single query"""
+    return db.session.execute(
+        select(CareerRoadmap)
+        .options(*_loader_options())
+        .where(CareerRoadmap.user_id == user_id)
+        .order_by(CareerRoadmap.created_at.desc())
+        .limit(1)
+    ).scalar_one_or_none()
+
 @career_bp.route('/roadmap', methods=['GET', 'POST'])
 @jwt_required()
+@cache_response(timeout=60, key_prefix=_roadmap_cache_key)
 def career_roadmap():
     """Generate or retrieve a career roadmap for the user"""
     user_id = get_jwt_identity()
     
     if request.method == 'POST':
         # Create a new roadmap
-        data = request.form or request.get_json()
+        data = get_request_data()
         
-        # Get user's CV skills (from latest uploaded CV)
-        user = User.query.get(user_id)
+        # Get user's CV path (from latest uploaded CV)
+        user = _user_cv_row(user_id)
         if not user:
             return jsonify({'error': userNotFoundErrStr}), 404
-            
-        # Extract skills from CV if user has uploaded one
-        cv_data = None
-        if user.cv_path and os.path.exists(user.cv_path):
-            cv_data = parse_cv(user.cv_path)
         
         # Get additional inputs for roadmap generation
         current_role = data.get('current_role', '')
         target_role = data.get('target_role', '')
         personality_traits = data.get('personality_traits', [])
         
-        # Use Gemini to generate career roadmap
-        roadmap_data = gemini_service.generate_career_roadmap(
-            cv_data=cv_data,
-            career_interests=[target_role],
-            personality_traits=personality_traits,
+        # Generate the roadmap in the background; the worker stores it and
+        # emits 'roadmap_ready' to the user once Gemini has answered
+        task = generate_roadmap_task.delay(
+            user.id, user.cv_path if user.cv_present else None,
+            current_role, target_role, personality_traits
         )
         
-        # Store the roadmap in the database
-        roadmap = CareerRoadmap(
-            user_id=user_id,
-            goals=roadmap_data.get('goals'),
-            recommended_skills=roadmap_data.get('recommended_skills'),
-            timeline=roadmap_data.get('timeline'),
-            current_role=current_role,
-            target_role=target_role
-        )
-        
-        db.session.add(roadmap)
-        db.session.commit()
-        
         return jsonify({
-            'message': 'Career roadmap created successfully',
-            'roadmap_id': roadmap.id,
-            'roadmap': roadmap_data
-        }), 201
+            'message': 'Career roadmap generation started',
+            'task_id': task.id,
+            'status_url': url_for('career.roadmap_status', task_id=task.id)
+        }), 202
     
     else:  # GET request
         # Retrieve the most recent roadmap for the user
-        roadmap = CareerRoadmap.query.filter_by(user_id=user_id).order_by(CareerRoadmap.created_at.desc()).first()
+        roadmap = _latest_roadmap(user_id)
         
         if not roadmap:
             return jsonify({'message': 'No career roadmap found. Please create one.'}), 404
             
-        return jsonify({
-            'roadmap_id': roadmap.id,
-            'goals': roadmap.goals,
-            'recommended_skills': roadmap.recommended_skills,
-            'timeline': roadmap.timeline,
-            'current_role': roadmap.current_role,
-            'target_role': roadmap.target_role,
-            'created_at': roadmap.created_at
-        })
+        return jsonify(serialize_roadmap(roadmap))
+
+@career_bp.route('/roadmap/status/<task_id>', methods=['GET'])
+@jwt_required()
+def roadmap_status(task_id):
+    """Check on a roadmap generation task"""
+    identity = get_jwt_identity()
+    result = generate_roadmap_task.AsyncResult(task_id)
+    
+    if result.failed():
+        return jsonify({'status': 'failed', 'error': 'Roadmap generation failed'}), 500
+    
+    if not result.successful():
+        return jsonify({'status': result.state.lower()}), 202
+    
+    payload = result.result
+    # The task stores the owner's integer id; tokens carry {'id': ..., 'type': ...}
+    if identity.get('type') != 'user' or payload.get('user_id') != identity['id']:
+        return jsonify({'error': 'Roadmap not found or access denied'}), 404
+    
+    return jsonify({
+        'status': 'completed',
+        'roadmap_id': payload['roadmap_id'],
+        'roadmap': payload['roadmap']
+    })
 
 @career_bp.route('/roadmap/<int:roadmap_id>', methods=['GET', 'PUT', 'DELETE'])
 @jwt_required()
 def manage_roadmap(roadmap_id):
     """Manage a specific career roadmap"""
     user_id = get_jwt_identity()
-    roadmap = CareerRoadmap.query.filter_by(id=roadmap_id, user_id=user_id).first()
+    # Fetch the owner's CV columns in the same round-trip for the regenerate branch
+    row = db.session.execute(
+        select(CareerRoadmap, User.cv_path, User.cv_present)
+        .join(User, User.id == CareerRoadmap.user_id)
+        .options(*_loader_options())
+        .where(CareerRoadmap.id == roadmap_id, CareerRoadmap.user_id == user_id)
+    ).first()
     
-    if not roadmap:
+    if not row:
         return jsonify({'error': 'Roadmap not found or access denied'}), 404
+    roadmap = row.CareerRoadmap
     
     if request.method == 'GET':
-        return jsonify({
-            'roadmap_id': roadmap.id,
-            'goals': roadmap.goals,
-            'recommended_skills': roadmap.recommended_skills,
-            'timeline': roadmap.timeline,
-            'current_role': roadmap.current_role,
-            'target_role': roadmap.target_role,
-            'created_at': roadmap.created_at
-        })
+        return jsonify(serialize_roadmap(roadmap))
         
     elif request.method == 'DELETE':
         db.session.delete(roadmap)
         db.session.commit()
+        invalidate_roadmap_cache(user_id)
         return jsonify({'message': 'Roadmap deleted successfully'})
     
-    data = request.form or request.get_json()
+    data = get_request_data()
     
     # Update roadmap fields
     roadmap.goals = data['goals'] if 'goals' in data else roadmap.goals
@@ -116,12 +169,9 @@ def manage_roadmap(roadmap_id):
     
     # Re-generate roadmap if significant changes
     if 'regenerate' in data and data['regenerate']:
-        user = User.query.get(user_id)
-        cv_data = None
-        if user.cv_path and os.path.exists(user.cv_path):
-            cv_data = parse_cv(user.cv_path)
+        cv_data = _load_user_cv(row)
             
-        roadmap_data = gemini_service.generate_career_advice(
+        roadmap_data = get_gemini().generate_career_advice(
             cv_data=cv_data,
             career_interests=[roadmap.target_role],
             personality_traits=data.get('personality_traits', [])
@@ -131,6 +181,7 @@ def manage_roadmap(roadmap_id):
         roadmap.timeline = roadmap_data.get('timeline')
     
     db.session.commit()
+    invalidate_roadmap_cache(user_id)
     return jsonify({'message': 'Roadmap updated successfully'})
 
 @career_bp.route('/advice', methods=['POST'])
@@ -138,17 +189,15 @@ def manage_roadmap(roadmap_id):
 def get_career_advice():
     """Get career advice based on uploaded CV and preferences"""
     user_id = get_jwt_identity()
-    user = User.query.get(user_id)
+    user = _user_cv_row(user_id)
     
     if not user:
         return jsonify({'error': userNotFoundErrStr}), 404
     
-    data = request.form or request.get_json()
+    data = get_request_data()
     
     # Extract skills from CV if user has uploaded one
-    cv_data = []
-    if user.cv_path and os.path.exists(user.cv_path):
-        cv_data = parse_cv(user.cv_path)
+    cv_data = _load_user_cv(user, default=[])
     
     # Get career preferences
     preferences = data.get('preferences', {})
@@ -157,27 +206,29 @@ def get_career_advice():
     prefs_list = [f"'Preference': {k}, 'value': {v} " for k, v in preferences.items()]
     
     # Use Gemini to generate career advice
-    advice = gemini_service.generate_career_advice(
+    advice = get_gemini().generate_career_advice(
         cv_data=cv_data,
         career_interests=prefs_list,
         personality_traits=personality_traits
     )
     
+    # Lift the headline lists out of the advice instead of sending them twice
     return jsonify({
-        'advice': advice,
-        'suitable_roles': advice.get('suitable_roles', []),
-        'skills_to_develop': advice.get('skills_to_develop', []),
-        'recommended_actions': advice.get('recommended_actions', [])
+        'suitable_roles': advice.pop('suitable_roles', []),
+        'skills_to_develop': advice.pop('skills_to_develop', []),
+        'recommended_actions': advice.pop('recommended_actions', []),
+        'advice': advice
     })
 
 @career_bp.route('/courses', methods=['GET'])
 @jwt_required()
+@cache_response(timeout=3600, key_prefix=_courses_cache_key)
 def recommended_courses():
     """Get recommended courses based on user's career roadmap"""
     user_id = get_jwt_identity()
     
     # Get user's latest roadmap
-    roadmap = CareerRoadmap.query.filter_by(user_id=user_id).order_by(CareerRoadmap.created_at.desc()).first()
+    roadmap = _latest_roadmap(user_id)
     
     if not roadmap:
         return jsonify({'error': 'No career roadmap found. Please create one first.'}), 404
@@ -191,27 +242,28 @@ def recommended_courses():
 def update_progress():
     """Update user's progress on roadmap activities"""
     user_id = get_jwt_identity()
-    data = request.form or request.get_json()
+    data = get_request_data()
     
     roadmap_id = data.get('roadmap_id')
-    roadmap = CareerRoadmap.query.filter_by(id=roadmap_id, user_id=user_id).first()
-    
-    if not roadmap:
-        return jsonify({'error': 'Roadmap not found or access denied'}), 404
-    
-    # Update progress data
     progress_data = data.get('progress', {})
-    if not roadmap.progress:
-        roadmap.progress = {}
     
-    # Merge new progress with existing progress
-    roadmap.progress.update(progress_data)
+    # Merge new progress into the stored JSONB in a single atomic statement
+    merged = func.coalesce(CareerRoadmap.progress, cast({}, JSONB)).op('||', return_type=JSONB)(cast(progress_data, JSONB))
+    current_progress = db.session.execute(
+        update(CareerRoadmap)
+        .where(CareerRoadmap.id == roadmap_id, CareerRoadmap.user_id == user_id)
+        .values(progress=merged)
+        .returning(CareerRoadmap.progress)
+    ).scalar_one_or_none()
+    
+    if current_progress is None:
+        return jsonify({'error': 'Roadmap not found or access denied'}), 404
     
     db.session.commit()
     
     return jsonify({
         'message': 'Progress updated successfully',
-        'current_progress': roadmap.progress
+        'current_progress': current_progress
     })
 
 @career_bp.route('/view', methods=['GET'])
@@ -219,13 +271,17 @@ def update_progress():
 def view_career_page():
     """Render the career development page"""
     user_id = get_jwt_identity()
-    user = User.query.get(user_id)
+    user = db.session.execute(
+        select(User)
+        .options(*_loader_options(selectinload(User.career_roadmaps)))
+        .where(User.id == user_id)
+    ).scalar_one_or_none()
     
     if not user:
         return jsonify({'error': userNotFoundErrStr}), 404
     
-    # Get the user's latest roadmap
-    roadmap = CareerRoadmap.query.filter_by(user_id=user_id).order_by(CareerRoadmap.created_at.desc()).first()
+    # Get the user's latest roadmap from the eagerly loaded collection
+    roadmap = max(user.career_roadmaps, key=lambda r: r.created_at, default=None)
     
     # Return the career development page with user data
     return render_template(
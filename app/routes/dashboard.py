@@ -1,13 +1,108 @@
 from flask import Blueprint, render_template, request, jsonify, current_app, abort
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from app.models import User, Interview, Application, CareerRoadmap, Enterprise, Job
-import app.services.scoring_service as scoring_service
-from sqlalchemy import func
-from datetime import datetime, timedelta
+from app.models import User, Interview, Application, CareerRoadmap, Enterprise, Job, MonthlyActivity
+from app.services.scoring_service import get_scoring_service
+from sqlalchemy import func, tuple_
+from sqlalchemy.orm import selectinload, contains_eager
+import functools
+from types import MappingProxyType
+from datetime import datetime, timedelta, time
 from app import db
+from app.utils.decorators import cache_response
+from app.utils.loaders import loader_options
+from app.utils.concurrency import run_concurrently
 
 dashboard = Blueprint('dashboard', __name__)
 
+# Mock CV feedback until real CV scoring lands; read-only and shared by all requests
+_CV_FEEDBACK = MappingProxyType({
+    'score': 75,  # Example score
+    'strengths': (
+        'Good technical skills section',
+        'Clear project descriptions',
+        'Relevant education background'
+    ),
+    'weaknesses': (
+        'Missing quantifiable achievements',
+        'Unclear career objective',
+        'Formatting inconsistencies'
+    ),
+    'improvement_suggestions': (
+        'Add metrics to your achievements (e.g., "Increased sales by 20%")',
+        'Create a clear and concise professional summary',
+        'Standardize the formatting throughout your CV'
+    )
+})
+
+# Dashboard charts poll these endpoints; serve repeats from cache for a few minutes
+CHART_CACHE_TIMEOUT = 300
+
+def _interview_progress_cache_key():
+    """Per-user cache key for the interview progress chart"""
+    return f"dashboard:interview-progress:{get_jwt_identity()}"
+
+def _job_performance_cache_key():
+    """Per-enterprise cache key for the job performance chart"""
+    return f"dashboard:job-performance:{get_jwt_identity()}"
+
+@functools.lru_cache(maxsize=1)
+def _six_months_ago(today):
+    """Start of the month 180 days before today (cached for the day)"""
+    return datetime.combine(today - timedelta(days=180), time.min).replace(day=1)
+
+def six_months_window():
+    """
+    Lower bound for the six-month dashboard charts.
+    
+    Rounded to a month start so the bound value only changes once a month
+    and the same compiled statement and plan are reused in between.
+    """
+    return _six_months_ago(datetime.utcnow().date())
+
+def _keyset_paginate(query, sort_expr, descending, parse_value, row_cursor):
+    """
+    Seek pagination of an Interview query on (sort_expr, Interview.id),
+    without OFFSET or COUNT(*).
+    
+    The page after a row is requested with ?cursor=<sort value>&cursor_id=<id>,
+    both taken from the next_cursor returned for the previous page.
+    
+    Args:
+        query: Query to paginate
+        sort_expr: Column or expression to order by; Interview.id breaks ties
+        descending: Whether to order descending
+        parse_value: Converts the 'cursor' query parameter back to a sort value
+        row_cursor: Returns the (sort value, id) of a result interview
+        
+    Returns:
+        Tuple of (rows for this page, next_cursor dict or None on the last page)
+    """
+    per_page = request.args.get('per_page', 20, type=int)
+    cursor = request.args.get('cursor')
+    cursor_id = request.args.get('cursor_id', type=int)
+    
+    if cursor is not None and cursor_id is not None:
+        position = tuple_(sort_expr, Interview.id)
+        bound = tuple_(parse_value(cursor), cursor_id)
+        query = query.filter(position < bound if descending else position > bound)
+    
+    if descending:
+        query = query.order_by(sort_expr.desc(), Interview.id.desc())
+    else:
+        query = query.order_by(sort_expr.asc(), Interview.id.asc())
+    
+    # Fetch one extra row to know whether there is a next page
+    rows = query.limit(per_page + 1).all()
+    next_cursor = None
+    if len(rows) > per_page:
+        rows = rows[:per_page]
+        value, row_id = row_cursor(rows[-1])
+        next_cursor = {
+            'cursor': value.isoformat() if isinstance(value, datetime) else value,
+            'cursor_id': row_id
+        }
+    return rows, next_cursor
+
 # User Dashboard Routes
 @dashboard.route('/user/dashboard', methods=['GET'])
 @jwt_required()
@@ -20,10 +115,14 @@ def user_dashboard():
         abort(403, "Access denied: Enterprise accounts should use the enterprise dashboard")
     
     # Get recent interviews (last 5)
-    interviews = Interview.query.filter_by(user_id=user_id).order_by(Interview.created_at.desc()).limit(5).all()
+    interviews = Interview.query.options(
+        *loader_options(Interview, "{ id score status interview_type created_at job { title } }")
+    ).filter_by(user_id=user_id).order_by(Interview.created_at.desc()).limit(5).all()
     
     # Get active job applications
-    applications = Application.query.filter_by(user_id=user_id).order_by(Application.created_at.desc()).limit(5).all()
+    applications = Application.query.options(
+        *loader_options(Application, "{ id status created_at job { title } }")
+    ).filter_by(user_id=user_id).order_by(Application.created_at.desc()).limit(5).all()
     
     # Get career roadmap if exists
     roadmap = CareerRoadmap.query.filter_by(user_id=user_id).first()
@@ -45,7 +144,9 @@ def user_assessments():
     page = request.args.get('page', 1, type=int)
     per_page = request.args.get('per_page', 10, type=int)
     
-    interviews = Interview.query.filter_by(user_id=user_id).order_by(
+    interviews = Interview.query.options(
+        *loader_options(Interview, "{ id job_id score status interview_type created_at }")
+    ).filter_by(user_id=user_id).order_by(
         Interview.created_at.desc()).paginate(page=page, per_page=per_page)
     
     return render_template('dashboard/user_assessments.html', 
@@ -58,13 +159,16 @@ def view_assessment(interview_id):
     """View detailed assessment for a specific interview"""
     user_id = get_jwt_identity()
     
-    interview = Interview.query.filter_by(id=interview_id, user_id=user_id).first_or_404()
+    # Load the questions with the interview instead of on first access
+    interview = Interview.query.options(
+        selectinload(Interview.questions)
+    ).filter_by(id=interview_id, user_id=user_id).first_or_404()
     
     # Get interview questions and answers
-    questions = interview.questions.all()
+    questions = interview.questions
     
     # Get assessment summary 
-    summary = scoring_service.generate_feedback_report(interview_id)
+    summary = get_scoring_service().cached_feedback_report(interview)
     
     return render_template('dashboard/assessment_detail.html',
                            interview=interview,
@@ -80,30 +184,11 @@ def user_cv_score():
     
     # Logic for retrieving CV score would be implemented here
     # This could involve accessing a stored score or calculating it on demand
-    
-    # For now, we'll return a mock response
-    cv_feedback = {
-        'score': 75,  # Example score
-        'strengths': [
-            'Good technical skills section',
-            'Clear project descriptions',
-            'Relevant education background'
-        ],
-        'weaknesses': [
-            'Missing quantifiable achievements',
-            'Unclear career objective',
-            'Formatting inconsistencies'
-        ],
-        'improvement_suggestions': [
-            'Add metrics to your achievements (e.g., "Increased sales by 20%")',
-            'Create a clear and concise professional summary',
-            'Standardize the formatting throughout your CV'
-        ]
-    }
+    # For now, we return the shared mock feedback
     
     return render_template('dashboard/cv_score.html', 
                            user=user,
-                           cv_feedback=cv_feedback)
+                           cv_feedback=_CV_FEEDBACK)
 
 @dashboard.route('/user/stats', methods=['GET'])
 @jwt_required()
@@ -111,43 +196,52 @@ def user_statistics():
     """Get user statistics and analytics"""
     user_id = get_jwt_identity()
     
-    # Get overall interview performance
-    interviews = Interview.query.filter_by(user_id=user_id).all()
-    
-    # Calculate average scores
-    if interviews:
-        avg_score = sum(interview.score for interview in interviews if interview.score) / len(interviews)
-        best_score = max(interview.score for interview in interviews if interview.score)
-    else:
-        avg_score = 0
-        best_score = 0
-    
-    # Get application success rate
-    applications = Application.query.filter_by(user_id=user_id).all()
-    successful_apps = sum(1 for app in applications if app.status == 'accepted')
-    app_success_rate = (successful_apps / len(applications)) * 100 if applications else 0
-    
-    # Get monthly interview count (last 6 months)
-    now = datetime.now()
-    six_months_ago = now - timedelta(days=180)
-    
-    monthly_interviews = db.session.query(
-        func.date_trunc('month', Interview.created_at).label('month'), 
-        func.count(Interview.id).label('count')
-    ).filter(
-        Interview.user_id == user_id,
-        Interview.created_at >= six_months_ago
-    ).group_by('month').order_by('month').all()
-    
-    # Format data for charts 
-    months = [item[0].strftime('%b %Y') for item in monthly_interviews]
-    interview_counts = [item[1] for item in monthly_interviews]
+    # Probe for any activity first: new users get zeroed stats from one query
+    has_interviews, has_applications = db.session.query(
+        db.session.query(Interview.id).filter(Interview.user_id == user_id).exists(),
+        db.session.query(Application.id).filter(Application.user_id == user_id).exists()
+    ).one()
+    
+    total_interviews, avg_score, best_score = 0, 0, 0
+    total_applications, app_success_rate = 0, 0
+    months, interview_counts = [], []
+    
+    if has_interviews:
+        # Get overall interview performance (aggregated in the database)
+        total_interviews, avg_score, best_score = db.session.query(
+            func.count(Interview.id),
+            func.avg(Interview.score),
+            func.max(Interview.score)
+        ).filter(Interview.user_id == user_id).one()
+        avg_score = float(avg_score or 0)
+        best_score = best_score or 0
+        
+        # Read the precomputed monthly rollup (refreshed hourly) for the last 6 months
+        monthly_interviews = db.session.query(
+            MonthlyActivity.month, MonthlyActivity.interview_count
+        ).filter(
+            MonthlyActivity.user_id == user_id,
+            MonthlyActivity.month >= six_months_window().date(),
+            MonthlyActivity.interview_count > 0
+        ).order_by(MonthlyActivity.month).all()
+        
+        # Format data for charts
+        months = [item[0].strftime('%b %Y') for item in monthly_interviews]
+        interview_counts = [item[1] for item in monthly_interviews]
+    
+    if has_applications:
+        # Get application success rate
+        total_applications, successful_apps = db.session.query(
+            func.count(Application.id),
+            func.count(Application.id).filter(Application.status == 'accepted')
+        ).filter(Application.user_id == user_id).one()
+        app_success_rate = (successful_apps / total_applications) * 100
     
     stats = {
         'avg_score': round(avg_score, 1),
         'best_score': best_score,
-        'total_interviews': len(interviews),
-        'total_applications': len(applications),
+        'total_interviews': total_interviews,
+        'total_applications': total_applications,
         'app_success_rate': round(app_success_rate, 1),
         'months': months,
         'interview_counts': interview_counts
@@ -163,42 +257,67 @@ def enterprise_dashboard():
     user_id = get_jwt_identity()
     enterprise = Enterprise.query.get_or_404(user_id)
     
-    # Get active job postings
-    active_jobs = Job.query.filter_by(enterprise_id=enterprise.id, status='active').all()
-    
-    # Get recent applications
-    recent_applications = db.session.query(Application, Job).join(
-        Job, Application.job_id == Job.id
-    ).filter(
-        Job.enterprise_id == enterprise.id
-    ).order_by(
-        Application.created_at.desc()
-    ).limit(10).all()
-    
-    # Get upcoming interviews
-    upcoming_interviews = db.session.query(Interview, User, Job).join(
-        User, Interview.user_id == User.id
-    ).join(
-        Job, Interview.job_id == Job.id
-    ).filter(
-        Job.enterprise_id == enterprise.id,
-        Interview.status == 'scheduled'
-    ).order_by(
-        Interview.scheduled_at.asc()
-    ).limit(5).all()
-    
-    # Get interview statistics
-    total_interviews = Interview.query.join(
-        Job, Interview.job_id == Job.id
-    ).filter(
-        Job.enterprise_id == enterprise.id
-    ).count()
-    
-    avg_score = db.session.query(func.avg(Interview.score)).join(
-        Job, Interview.job_id == Job.id
-    ).filter(
-        Job.enterprise_id == enterprise.id
-    ).scalar() or 0
+    # The four sections are independent: run their queries concurrently
+    # instead of waiting on one round trip after another
+    def active_jobs_query():
+        return Job.query.options(
+            *loader_options(Job, "{ id title location job_type status created_at expires_at }")
+        ).filter_by(enterprise_id=enterprise_id, status='active').all()
+    
+    # The two lists select plain rows: no identity map or instrumentation per row
+    def recent_applications_query():
+        return db.session.query(
+            Application.id,
+            Application.user_id,
+            Application.status,
+            Application.created_at,
+            Job.id.label('job_id'),
+            Job.title.label('job_title')
+        ).join(
+            Job, Application.job_id == Job.id
+        ).filter(
+            Job.enterprise_id == enterprise_id
+        ).order_by(
+            Application.created_at.desc()
+        ).limit(10).all()
+    
+    def upcoming_interviews_query():
+        return db.session.query(
+            Interview.id,
+            Interview.status,
+            Interview.interview_type,
+            Interview.scheduled_time,
+            User.id.label('user_id'),
+            User.name.label('candidate_name'),
+            User.email.label('candidate_email'),
+            Job.id.label('job_id'),
+            Job.title.label('job_title')
+        ).join(
+            User, Interview.user_id == User.id
+        ).join(
+            Job, Interview.job_id == Job.id
+        ).filter(
+            Job.enterprise_id == enterprise_id,
+            Interview.status == 'scheduled'
+        ).order_by(
+            Interview.scheduled_time.asc()
+        ).limit(5).all()
+    
+    def interview_stats_query():
+        # Count and average in one round trip
+        return db.session.query(
+            func.count(Interview.id), func.avg(Interview.score)
+        ).join(
+            Job, Interview.job_id == Job.id
+        ).filter(
+            Job.enterprise_id == enterprise_id
+        ).one()
+    
+    enterprise_id = enterprise.id
+    active_jobs, recent_applications, upcoming_interviews, (total_interviews, avg_score) = run_concurrently(
+        active_jobs_query, recent_applications_query, upcoming_interviews_query, interview_stats_query
+    )
+    avg_score = float(avg_score or 0)
     
     return render_template('dashboard/enterprise_dashboard.html',
                           enterprise=enterprise,
@@ -221,11 +340,15 @@ def enterprise_interviews():
     sort_by = request.args.get('sort_by', 'date')  # 'date', 'score'
     sort_order = request.args.get('sort_order', 'desc')  # 'asc', 'desc'
     
-    # Build query
-    query = db.session.query(Interview, User, Job).join(
-        User, Interview.user_id == User.id
+    # Build query; the joined user and job populate interview.user / interview.job
+    query = db.session.query(Interview).join(
+        Interview.user
     ).join(
-        Job, Interview.job_id == Job.id
+        Interview.job
+    ).options(
+        *loader_options(Interview, "{ id user_id job_id score status interview_type created_at }"),
+        contains_eager(Interview.user).load_only(User.id, User.name, User.email),
+        contains_eager(Interview.job).load_only(Job.id, Job.title)
     ).filter(
         Job.enterprise_id == enterprise.id
     )
@@ -237,29 +360,29 @@ def enterprise_interviews():
     if status:
         query = query.filter(Interview.status == status)
     
-    # Apply sorting
+    # Apply sorting and fetch the page (unscored interviews sort as -1)
+    descending = sort_order != 'asc'
     if sort_by == 'score':
-        if sort_order == 'asc':
-            query = query.order_by(Interview.score.asc())
-        else:
-            query = query.order_by(Interview.score.desc())
+        score = func.coalesce(Interview.score, -1.0)
+        interviews, next_cursor = _keyset_paginate(
+            query, score, descending, float,
+            lambda interview: (interview.score if interview.score is not None else -1.0, interview.id)
+        )
     else:  # Default to date sorting
-        if sort_order == 'asc':
-            query = query.order_by(Interview.created_at.asc())
-        else:
-            query = query.order_by(Interview.created_at.desc())
-    
-    # Paginate results
-    page = request.args.get('page', 1, type=int)
-    per_page = request.args.get('per_page', 20, type=int)
-    pagination = query.paginate(page=page, per_page=per_page)
+        interviews, next_cursor = _keyset_paginate(
+            query, Interview.created_at, descending, datetime.fromisoformat,
+            lambda interview: (interview.created_at, interview.id)
+        )
     
     # Get all jobs for filter dropdown
-    jobs = Job.query.filter_by(enterprise_id=enterprise.id).all()
+    jobs = Job.query.options(
+        *loader_options(Job, "{ id title }")
+    ).filter_by(enterprise_id=enterprise.id).all()
     
     return render_template('dashboard/enterprise_interviews.html',
                           enterprise=enterprise,
-                          pagination=pagination,
+                          interviews=interviews,
+                          next_cursor=next_cursor,
                           jobs=jobs,
                           current_filters={
                               'job_id': job_id,
@@ -287,31 +410,61 @@ def enterprise_statistics():
     else:
         start_date = None
     
-    # Base queries with time filter if applicable
-    job_query = Job.query.filter_by(enterprise_id=enterprise.id)
-    if start_date:
-        job_query = job_query.filter(Job.created_at >= start_date)
-    
-    application_query = db.session.query(Application).join(
-        Job, Application.job_id == Job.id
-    ).filter(
-        Job.enterprise_id == enterprise.id
-    )
-    if start_date:
-        application_query = application_query.filter(Application.created_at >= start_date)
-    
-    interview_query = db.session.query(Interview).join(
-        Job, Interview.job_id == Job.id
-    ).filter(
-        Job.enterprise_id == enterprise.id
+    enterprise_id = enterprise.id
+    
+    def time_filter(column):
+        return [column >= start_date] if start_date else []
+    
+    def totals_query():
+        # All four totals as scalar subqueries of a single SELECT: one round trip
+        jobs = db.session.query(func.count(Job.id)).filter(
+            Job.enterprise_id == enterprise_id, *time_filter(Job.created_at)
+        ).scalar_subquery()
+        applications = db.session.query(func.count(Application.id)).join(
+            Job, Application.job_id == Job.id
+        ).filter(
+            Job.enterprise_id == enterprise_id, *time_filter(Application.created_at)
+        ).scalar_subquery()
+        interviews = db.session.query(
+            func.count(Interview.id).label('total'), func.avg(Interview.score).label('avg_score')
+        ).join(
+            Job, Interview.job_id == Job.id
+        ).filter(
+            Job.enterprise_id == enterprise_id, *time_filter(Interview.created_at)
+        ).subquery()
+        return db.session.query(
+            jobs, applications, interviews.c.total, interviews.c.avg_score
+        ).select_from(interviews).one()
+    
+    def top_candidates_query():
+        # Top performing candidates (highest scores)
+        return db.session.query(
+            User.id, User.name, Interview.score, Job.title
+        ).join(
+            Interview, User.id == Interview.user_id
+        ).join(
+            Job, Interview.job_id == Job.id
+        ).filter(
+            Job.enterprise_id == enterprise_id
+        ).order_by(
+            Interview.score.desc()
+        ).limit(5).all()
+    
+    def application_trend_query():
+        # Read the precomputed rollup (refreshed hourly) instead of scanning applications
+        return db.session.query(
+            MonthlyActivity.month, MonthlyActivity.application_count
+        ).filter(
+            MonthlyActivity.enterprise_id == enterprise_id,
+            MonthlyActivity.month >= six_months_window().date(),
+            MonthlyActivity.application_count > 0
+        ).order_by(MonthlyActivity.month).all()
+    
+    totals, top_candidates, application_trend = run_concurrently(
+        totals_query, top_candidates_query, application_trend_query
     )
-    if start_date:
-        interview_query = interview_query.filter(Interview.created_at >= start_date)
-    
-    # Calculate statistics
-    total_jobs = job_query.count()
-    total_applications = application_query.count()
-    total_interviews = interview_query.count()
+    total_jobs, total_applications, total_interviews, avg_score = totals
+    avg_score = float(avg_score or 0)
     
     # Applications per job
     applications_per_job = total_applications / total_jobs if total_jobs > 0 else 0
@@ -319,45 +472,6 @@ def enterprise_statistics():
     # Interview conversion rate
     interview_conversion = (total_interviews / total_applications * 100) if total_applications > 0 else 0
     
-    # Average score
-    avg_score = db.session.query(func.avg(Interview.score)).select_from(
-        Interview
-    ).join(
-        Job, Interview.job_id == Job.id
-    ).filter(
-        Job.enterprise_id == enterprise.id
-    )
-    if start_date:
-        avg_score = avg_score.filter(Interview.created_at >= start_date)
-    avg_score = avg_score.scalar() or 0
-    
-    # Top performing candidates (highest scores)
-    top_candidates = db.session.query(
-        User.id, User.name, Interview.score, Job.title
-    ).join(
-        Interview, User.id == Interview.user_id
-    ).join(
-        Job, Interview.job_id == Job.id
-    ).filter(
-        Job.enterprise_id == enterprise.id
-    ).order_by(
-        Interview.score.desc()
-    ).limit(5).all()
-    
-    # Application trend over time (last 6 months)
-    now = datetime.now()
-    six_months_ago = now - timedelta(days=180)
-    
-    application_trend = db.session.query(
-        func.date_trunc('month', Application.created_at).label('month'), 
-        func.count(Application.id).label('count')
-    ).join(
-        Job, Application.job_id == Job.id
-    ).filter(
-        Job.enterprise_id == enterprise.id,
-        Application.created_at >= six_months_ago
-    ).group_by('month').order_by('month').all()
-    
     # Format data for charts
     trend_months = [item[0].strftime('%b %Y') for item in application_trend]
     application_counts = [item[1] for item in application_trend]
@@ -389,13 +503,15 @@ def top_candidates():
     # Filter by job if specified
     job_id = request.args.get('job_id', type=int)
     
-    # Get top candidates query
-    query = db.session.query(
-        User, Interview, Job
-    ).join(
-        Interview, User.id == Interview.user_id
+    # Get top candidates query (interviews with their candidate and job attached)
+    query = db.session.query(Interview).join(
+        Interview.user
     ).join(
-        Job, Interview.job_id == Job.id
+        Interview.job
+    ).options(
+        *loader_options(Interview, "{ id user_id job_id score status created_at }"),
+        contains_eager(Interview.user).load_only(User.id, User.name, User.email),
+        contains_eager(Interview.job).load_only(Job.id, Job.title)
     ).filter(
         Job.enterprise_id == enterprise.id,
         Interview.score.isnot(None)  # Ensure there is a score
@@ -404,77 +520,101 @@ def top_candidates():
     if job_id:
         query = query.filter(Job.id == job_id)
     
-    query = query.order_by(Interview.score.desc())
-    
-    # Paginate results
-    page = request.args.get('page', 1, type=int)
-    per_page = request.args.get('per_page', 20, type=int)
-    pagination = query.paginate(page=page, per_page=per_page)
+    # Fetch the page, best scores first
+    candidates, next_cursor = _keyset_paginate(
+        query, Interview.score, True, float,
+        lambda interview: (interview.score, interview.id)
+    )
     
     # Get all jobs for filter
-    jobs = Job.query.filter_by(enterprise_id=enterprise.id).all()
+    jobs = Job.query.options(
+        *loader_options(Job, "{ id title }")
+    ).filter_by(enterprise_id=enterprise.id).all()
     
     return render_template('dashboard/top_candidates.html',
                           enterprise=enterprise,
-                          pagination=pagination,
+                          candidates=candidates,
+                          next_cursor=next_cursor,
                           jobs=jobs,
                           current_job_id=job_id)
 
 # API endpoints for dashboard data
 @dashboard.route('/api/user/interview-progress', methods=['GET'])
 @jwt_required()
+@cache_response(timeout=CHART_CACHE_TIMEOUT, key_prefix=_interview_progress_cache_key)
 def api_user_interview_progress():
     """API endpoint to get user interview progress over time"""
     user_id = get_jwt_identity()
     
     # Get interviews from the last 6 months
-    six_months_ago = datetime.now() - timedelta(days=180)
-    
-    interviews = Interview.query.filter(
+    six_months_ago = six_months_window()
+    
+    # Only scored interviews are charted: filter them in SQL instead of
+    # loading every row and discarding the unscored ones in Python.
+    # Select the chart fields as plain rows (no ORM objects, no lazy job loads)
+    points = db.session.query(
+        func.to_char(Interview.created_at, 'YYYY-MM-DD').label('date'),
+        Interview.score.label('score'),
+        func.coalesce(Job.title, 'General Assessment').label('job_title')
+    ).outerjoin(
+        Job, Interview.job_id == Job.id
+    ).filter(
         Interview.user_id == user_id,
-        Interview.created_at >= six_months_ago
+        Interview.created_at >= six_months_ago,
+        Interview.score.isnot(None)
     ).order_by(Interview.created_at.asc()).all()
     
-    # Format data for chart
-    data = [{
-        'date': interview.created_at.strftime('%Y-%m-%d'),
-        'score': interview.score,
-        'job_title': interview.job.title if interview.job else 'General Assessment'
-    } for interview in interviews if interview.score is not None]
-    
-    return jsonify(data)
+    # Serialized by the app's orjson provider
+    return jsonify([point._asdict() for point in points])
 
 @dashboard.route('/api/enterprise/job-performance', methods=['GET'])
 @jwt_required()
+@cache_response(timeout=CHART_CACHE_TIMEOUT, key_prefix=_job_performance_cache_key)
 def api_job_performance():
     """API endpoint to get performance metrics by job"""
     user_id = get_jwt_identity()
     enterprise = Enterprise.query.get_or_404(user_id)
     
-    # Get all jobs and their associated metrics
-    jobs = Job.query.filter_by(enterprise_id=enterprise.id).all()
+    # Aggregate applications and interviews per job in their own subqueries
+    # (joining both onto Job directly would multiply the rows) and fetch
+    # every job's metrics in a single statement
+    enterprise_job_ids = db.session.query(Job.id).filter(Job.enterprise_id == enterprise.id)
     
-    results = []
-    for job in jobs:
-        # Count applications
-        application_count = Application.query.filter_by(job_id=job.id).count()
-        
-        # Count interviews
-        interview_count = Interview.query.filter_by(job_id=job.id).count()
-        
-        # Get average score
-        avg_score = db.session.query(func.avg(Interview.score)).filter(
-            Interview.job_id == job.id,
-            Interview.score.isnot(None)
-        ).scalar() or 0
-        
-        results.append({
-            'job_id': job.id,
-            'job_title': job.title,
-            'applications': application_count,
-            'interviews': interview_count,
-            'avg_score': round(float(avg_score), 1),
-            'conversion_rate': round((interview_count / application_count * 100), 1) if application_count > 0 else 0
-        })
+    application_counts = db.session.query(
+        Application.job_id, func.count(Application.id).label('applications')
+    ).filter(
+        Application.job_id.in_(enterprise_job_ids)
+    ).group_by(Application.job_id).subquery()
+    
+    interview_stats = db.session.query(
+        Interview.job_id,
+        func.count(Interview.id).label('interviews'),
+        func.avg(Interview.score).label('avg_score')
+    ).filter(
+        Interview.job_id.in_(enterprise_job_ids)
+    ).group_by(Interview.job_id).subquery()
+    
+    jobs = db.session.query(
+        Job.id,
+        Job.title,
+        func.coalesce(application_counts.c.applications, 0),
+        func.coalesce(interview_stats.c.interviews, 0),
+        func.coalesce(interview_stats.c.avg_score, 0)
+    ).outerjoin(
+        application_counts, application_counts.c.job_id == Job.id
+    ).outerjoin(
+        interview_stats, interview_stats.c.job_id == Job.id
+    ).filter(
+        Job.enterprise_id == enterprise.id
+    ).all()
+    
+    results = [{
+        'job_id': job_id,
+        'job_title': title,
+        'applications': application_count,
+        'interviews': interview_count,
+        'avg_score': round(float(avg_score), 1),
+        'conversion_rate': round((interview_count / application_count * 100), 1) if application_count > 0 else 0
+    } for job_id, title, application_count, interview_count, avg_score in jobs]
     
     return jsonify(results)
\ No newline at end of file
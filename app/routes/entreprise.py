@@ -1,56 +1,118 @@
-from flask import Blueprint, request, jsonify, render_template, current_app
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask import Blueprint, request, jsonify, render_template, stream_template, current_app, g
+from flask_jwt_extended import jwt_required
 from app.models import Enterprise, Job, Interview, User, Application, db, TeamMember
-from app.utils.decorators import enterprise_required
+from app.utils.decorators import enterprise_required, cache_response
+from app.utils.enterprise_cache import load_enterprise, invalidate_enterprise
+from app.utils.concurrency import run_concurrently
 from datetime import datetime, timezone
+from dateutil.relativedelta import relativedelta
+from types import MappingProxyType
+import hashlib
 import json
-from werkzeug.security import generate_password_hash
-from sqlalchemy import func
+import secrets
+from sqlalchemy import func, select, update, cast, bindparam, lambda_stmt
+from sqlalchemy.orm import load_only, with_loader_criteria
+from sqlalchemy.dialects.postgresql import JSONB, insert as pg_insert
 
 
 enterprise_bp = Blueprint('enterprise', __name__, url_prefix='/enterprise')
 enterpriseNotFoundErrStr = "Enterprise not found"
+teamMemberNotFoundErrStr = "Team member not found"
+ANALYTICS_CACHE_TIMEOUT = 60
+
+# Profile fields accepted on PUT, mapped to their Enterprise columns
+_PROFILE_FIELDS = MappingProxyType({
+    'name': 'name',
+    'industry': 'industry',
+    'description': 'description',
+    'location': 'location',
+    'website': 'website',
+    'company_size': 'size'
+})
+
+# Settings accepted on PUT, stored as keys of Enterprise.custom_settings
+_SETTINGS_KEYS = ('notification_preferences', 'interview_settings', 'ai_behavior_settings')
+
+# Limits and features per subscription plan
+PLAN_CONFIG = MappingProxyType({
+    'basic': MappingProxyType({
+        'max_jobs_allowed': 5,
+        'max_interviews_allowed': 20,
+        'features': ('Basic analytics', 'Standard AI interviews')
+    }),
+    'pro': MappingProxyType({
+        'max_jobs_allowed': 20,
+        'max_interviews_allowed': 100,
+        'features': ('Advanced analytics', 'Custom AI behavior', 'Priority support')
+    }),
+    'enterprise': MappingProxyType({
+        'max_jobs_allowed': 100,
+        'max_interviews_allowed': 500,
+        'features': ('Full analytics suite', 'Custom AI behavior', '24/7 support', 'API access', 'White labeling')
+    })
+})
+
+# subscription_features is stored as JSON text; serialize each plan's list once at import
+_PLAN_FEATURES = MappingProxyType({
+    plan: json.dumps(list(config['features'])) for plan, config in PLAN_CONFIG.items()
+})
+
+
+def _conditional_page(version, render):
+    """Render a page with a weak ETag derived from version, answering 304 if the client has it."""
+    etag = hashlib.blake2s(repr(version).encode(), digest_size=8).hexdigest()
+    if request.if_none_match.contains_weak(etag):
+        response = current_app.response_class(status=304)
+    else:
+        response = current_app.make_response(render())
+    response.set_etag(etag, weak=True)
+    response.cache_control.private = True
+    response.cache_control.must_revalidate = True
+    return response
+
+
+def enterprise_jobs(enterprise_id):
+    """Loader option limiting every Job in a statement to one enterprise's jobs."""
+    # A lambda criterion is built once and cached; only enterprise_id is bound per request
+    return with_loader_criteria(
+        Job, lambda cls: cls.enterprise_id == enterprise_id, include_aliases=True
+    )
+
+
+# Hot team member lookup, compiled once and reused with new parameters
+_enterprise_team_member = lambda_stmt(
+    lambda: select(TeamMember).where(
+        TeamMember.id == bindparam('member_id'),
+        TeamMember.enterprise_id == bindparam('enterprise_id')
+    )
+)
 
 @enterprise_bp.route('/profile', methods=['GET', 'PUT'])
 @jwt_required()
 @enterprise_required
 def enterprise_profile():
-    identity = get_jwt_identity()
-    enterprise = Enterprise.query.get(identity['id'])
-    
-    if not enterprise:
-        return jsonify({'error': enterpriseNotFoundErrStr}), 404
-    
     if request.method == 'GET':
-        return render_template('enterprise/profile.html', enterprise=enterprise)
+        return _conditional_page(
+            ('profile', g.enterprise.id, g.enterprise.updated_at),
+            lambda: render_template('enterprise/profile.html', enterprise=g.enterprise)
+        )
     
-    # PUT request to update profile
+    # PUT request to update profile: one UPDATE of the sent fields, without loading the row
     data = request.get_json()
+    changed = {
+        column: data[field] for field, column in _PROFILE_FIELDS.items() if field in data
+    }
+    changed['updated_at'] = datetime.now(timezone.utc)
     
-    # Update allowed fields
-    if 'name' in data:
-        enterprise.name = data['name']
-    
-    if 'industry' in data:
-        enterprise.industry = data['industry']
-    
-    if 'description' in data:
-        enterprise.description = data['description']
-    
-    if 'location' in data:
-        enterprise.location = data['location']
-    
-    if 'website' in data:
-        enterprise.website = data['website']
-    
-    if 'company_size' in data:
-        enterprise.company_size = data['company_size']
+    enterprise_id = db.session.execute(
+        update(Enterprise).where(Enterprise.id == g.enterprise.id).values(**changed).returning(Enterprise.id)
+    ).scalar_one_or_none()
     
-    if 'founded_year' in data:
-        enterprise.founded_year = data['founded_year']
+    if enterprise_id is None:
+        return jsonify({'error': enterpriseNotFoundErrStr}), 404
     
-    enterprise.updated_at = datetime.now(timezone.utc)
     db.session.commit()
+    invalidate_enterprise(enterprise_id)
     
     return jsonify({'message': 'Profile updated successfully'}), 200
 
@@ -58,32 +120,30 @@ def enterprise_profile():
 @jwt_required()
 @enterprise_required
 def enterprise_settings():
-    identity = get_jwt_identity()
-    enterprise = Enterprise.query.get(identity['id'])
-    
-    if not enterprise:
-        return jsonify({'error': enterpriseNotFoundErrStr}), 404
-    
     if request.method == 'GET':
-        return render_template('enterprise/settings.html', enterprise=enterprise)
+        return _conditional_page(
+            ('settings', g.enterprise.id, g.enterprise.updated_at),
+            lambda: render_template('enterprise/settings.html', enterprise=g.enterprise)
+        )
     
-    # PUT request to update settings
+    # PUT request to update settings: notification preferences, interview settings
+    # and custom AI behavior settings are merged into custom_settings in one UPDATE
     data = request.get_json()
+    changed = {key: data[key] for key in _SETTINGS_KEYS if key in data}
+    merged = func.coalesce(Enterprise.custom_settings, cast({}, JSONB)).op('||', return_type=JSONB)(cast(changed, JSONB))
     
-    # Update notification preferences
-    if 'notification_preferences' in data:
-        enterprise.notification_preferences = data['notification_preferences']
-    
-    # Update interview settings
-    if 'interview_settings' in data:
-        enterprise.interview_settings = data['interview_settings']
+    enterprise_id = db.session.execute(
+        update(Enterprise)
+        .where(Enterprise.id == g.enterprise.id)
+        .values(custom_settings=merged, updated_at=datetime.now(timezone.utc))
+        .returning(Enterprise.id)
+    ).scalar_one_or_none()
     
-    # Update custom AI behavior settings
-    if 'ai_behavior_settings' in data:
-        enterprise.ai_behavior_settings = data['ai_behavior_settings']
+    if enterprise_id is None:
+        return jsonify({'error': enterpriseNotFoundErrStr}), 404
     
-    enterprise.updated_at = datetime.now(timezone.utc)
     db.session.commit()
+    invalidate_enterprise(enterprise_id)
     
     return jsonify({'message': 'Settings updated successfully'}), 200
 
@@ -91,26 +151,27 @@ def enterprise_settings():
 @jwt_required()
 @enterprise_required
 def list_team_members():
-    identity = get_jwt_identity()
-    enterprise = Enterprise.query.get(identity['id'])
-    
-    if not enterprise:
-        return jsonify({'error': enterpriseNotFoundErrStr}), 404
-    
-    # Assuming we have a TeamMember model linked to Enterprise
-    team_members = enterprise.team_members
-    
-    return render_template('enterprise/team.html', team_members=team_members)
+    enterprise = g.enterprise
+    
+    # Version the page by member count and latest change, so a 304 skips loading the members
+    member_count, last_update = db.session.query(
+        func.count(TeamMember.id), func.max(TeamMember.updated_at)
+    ).filter(TeamMember.enterprise_id == enterprise.id).one()
+    
+    # The cached record has no relationships; query the members directly
+    return _conditional_page(
+        ('team', enterprise.id, member_count, last_update),
+        lambda: render_template(
+            'enterprise/team.html',
+            team_members=TeamMember.query.filter_by(enterprise_id=enterprise.id).all()
+        )
+    )
 
 @enterprise_bp.route('/team/add', methods=['POST'])
 @jwt_required()
 @enterprise_required
 def add_team_member():
-    identity = get_jwt_identity()
-    enterprise = Enterprise.query.get(identity['id'])
-    
-    if not enterprise:
-        return jsonify({'error': enterpriseNotFoundErrStr}), 404
+    enterprise = g.enterprise
     
     data = request.get_json()
     
@@ -118,29 +179,24 @@ def add_team_member():
     if not all(field in data for field in ['email', 'name', 'role']):
         return jsonify({'error': 'Missing required fields'}), 400
     
-    # Check if the team member already exists
-    existing_member = TeamMember.query.filter_by(
-        enterprise_id=enterprise.id,
-        email=data['email']
-    ).first()
-    
-    if existing_member:
+    # Create new team member; no password is hashed until they accept the invitation.
+    # ON CONFLICT replaces the separate existence check: no RETURNING row means the email is taken
+    new_member_id = db.session.execute(
+        pg_insert(TeamMember).values(
+            enterprise_id=enterprise.id,
+            email=data['email'],
+            name=data['name'],
+            role=data['role'],
+            invitation_token=secrets.token_urlsafe(32),
+            created_at=datetime.now(timezone.utc)
+        ).on_conflict_do_nothing(
+            index_elements=[TeamMember.email]
+        ).returning(TeamMember.id)
+    ).scalar()
+    
+    if new_member_id is None:
         return jsonify({'error': 'Team member already exists'}), 409
     
-    # Create a temporary password for the team member
-    temp_password = generate_password_hash(str(datetime.now(timezone.utc)))
-    
-    # Create new team member
-    new_member = TeamMember(
-        enterprise_id=enterprise.id,
-        email=data['email'],
-        name=data['name'],
-        role=data['role'],
-        password=temp_password,  # Will be reset on first login
-        created_at=datetime.now(timezone.utc)
-    )
-    
-    db.session.add(new_member)
     db.session.commit()
     
     return jsonify({'message': 'Team member added successfully'}), 201
@@ -149,112 +205,107 @@ def add_team_member():
 @jwt_required()
 @enterprise_required
 def manage_team_member(member_id):
-    identity = get_jwt_identity()
-    enterprise = Enterprise.query.get(identity['id'])
-    
-    if not enterprise:
-        return jsonify({'error': enterpriseNotFoundErrStr}), 404
-    
-    # Find the team member
-    team_member = TeamMember.query.filter_by(
-        id=member_id,
-        enterprise_id=enterprise.id
-    ).first()
-    
-    if not team_member:
-        return jsonify({'error': 'Team member not found'}), 404
+    enterprise = g.enterprise
     
     if request.method == 'PUT':
+        # One UPDATE of the sent fields, scoped to this enterprise's members
         data = request.get_json()
+        changed = {field: data[field] for field in ('name', 'role') if field in data}
+        changed['updated_at'] = datetime.now(timezone.utc)
         
-        # Update allowed fields
-        if 'name' in data:
-            team_member.name = data['name']
-        
-        if 'role' in data:
-            team_member.role = data['role']
+        updated_id = db.session.execute(
+            update(TeamMember)
+            .where(TeamMember.id == member_id, TeamMember.enterprise_id == enterprise.id)
+            .values(**changed)
+            .returning(TeamMember.id)
+        ).scalar_one_or_none()
         
-        if 'permissions' in data:
-            team_member.permissions = data['permissions']
+        if updated_id is None:
+            return jsonify({'error': teamMemberNotFoundErrStr}), 404
         
-        team_member.updated_at = datetime.now(timezone.utc)
         db.session.commit()
         
         return jsonify({'message': 'Team member updated successfully'}), 200
     
+    # Find the team member
+    team_member = db.session.execute(
+        _enterprise_team_member, {'member_id': member_id, 'enterprise_id': enterprise.id}
+    ).scalar_one_or_none()
+    
+    if not team_member:
+        return jsonify({'error': teamMemberNotFoundErrStr}), 404
+    
     # DELETE request
     db.session.delete(team_member)
     db.session.commit()
     
     return jsonify({'message': 'Team member removed successfully'}), 200
 
+def analytics_counts(enterprise_id):
+    """Return (jobs, applications, interviews) counts for one enterprise in a single SELECT."""
+    # Loader criteria don't reach into scalar subqueries, so each one filters explicitly
+    jobs_count = db.session.query(func.count(Job.id)).filter(
+        Job.enterprise_id == enterprise_id
+    ).scalar_subquery()
+    applications_count = db.session.query(func.count(Application.id)).join(
+        Job, Application.job_id == Job.id
+    ).filter(Job.enterprise_id == enterprise_id).scalar_subquery()
+    interviews_count = db.session.query(func.count(Interview.id)).join(
+        Job, Interview.job_id == Job.id
+    ).filter(Job.enterprise_id == enterprise_id).scalar_subquery()
+    return tuple(db.session.query(jobs_count, applications_count, interviews_count).one())
+
+def _analytics_cache_key():
+    return f"analytics_html:{g.enterprise.id}"
+
 @enterprise_bp.route('/analytics', methods=['GET'])
 @jwt_required()
 @enterprise_required
+@cache_response(timeout=ANALYTICS_CACHE_TIMEOUT, key_prefix=_analytics_cache_key, mimetype='text/html')
 def enterprise_analytics():
-    identity = get_jwt_identity()
-    enterprise = Enterprise.query.get(identity['id'])
-    
-    if not enterprise:
-        return jsonify({'error': enterpriseNotFoundErrStr}), 404
-    
-    # Get analytics data
-    # Jobs count
-    jobs_count = Job.query.filter_by(enterprise_id=enterprise.id).count()
-    
-    # Applications count
-    applications_count = db.session.query(func.count(Application.id)).\
-        join(Job).filter(Job.enterprise_id == enterprise.id).scalar()
-    
-    # Interviews count
-    interviews_count = db.session.query(func.count(Interview.id)).\
-        join(Job).filter(Job.enterprise_id == enterprise.id).scalar()
-    
-    # Top performing candidates
-    top_candidates = db.session.query(
-        User.id, User.name, User.email, Interview.score
-    ).join(
-        Interview, User.id == Interview.user_id
-    ).join(
-        Job, Interview.job_id == Job.id
-    ).filter(
-        Job.enterprise_id == enterprise.id
-    ).order_by(
-        Interview.score.desc()
-    ).limit(10).all()
-    
-    # Most applied to jobs
-    most_applied_jobs = db.session.query(
-        Job.id, Job.title, func.count(Application.id).label('application_count')
-    ).join(
-        Application, Job.id == Application.job_id
-    ).filter(
-        Job.enterprise_id == enterprise.id
-    ).group_by(
-        Job.id
-    ).order_by(
-        func.count(Application.id).desc()
-    ).limit(5).all()
+    enterprise = g.enterprise
+    
+    own_jobs = enterprise_jobs(enterprise.id)
+    
+    def counts_query():
+        return analytics_counts(enterprise.id)
+    
+    def top_candidates_query():
+        # Top performing candidates
+        return db.session.query(
+            User.id, User.name, User.email, Interview.score
+        ).join(
+            Interview, User.id == Interview.user_id
+        ).join(
+            Job, Interview.job_id == Job.id
+        ).options(
+            own_jobs
+        ).order_by(
+            Interview.score.desc()
+        ).limit(10).all()
+    
+    def most_applied_jobs_query():
+        # Most applied to jobs, from the maintained counter (ix_jobs_enterprise_application_count)
+        return db.session.query(
+            Job.id, Job.title, Job.application_count
+        ).options(
+            own_jobs
+        ).order_by(
+            Job.application_count.desc()
+        ).limit(5).all()
+    
+    # Independent queries: run them side by side rather than one after another
+    (jobs_count, applications_count, interviews_count), top_candidates, most_applied_jobs = run_concurrently(
+        counts_query, top_candidates_query, most_applied_jobs_query
+    )
     
     analytics_data = {
         'jobs_count': jobs_count,
         'applications_count': applications_count,
         'interviews_count': interviews_count,
-        'top_candidates': [
-            {
-                'id': candidate.id,
-                'name': candidate.name,
-                'email': candidate.email,
-                'score': candidate.score
-            } for candidate in top_candidates
-        ],
-        'most_applied_jobs': [
-            {
-                'id': job.id,
-                'title': job.title,
-                'application_count': job.application_count
-            } for job in most_applied_jobs
-        ]
+        # Rows support attribute access (candidate.name, job.title) in the template as-is
+        'top_candidates': top_candidates,
+        'most_applied_jobs': most_applied_jobs
     }
     
     return render_template('enterprise/analytics.html', analytics=analytics_data)
@@ -263,11 +314,7 @@ def enterprise_analytics():
 @jwt_required()
 @enterprise_required
 def subscription_status():
-    identity = get_jwt_identity()
-    enterprise = Enterprise.query.get(identity['id'])
-    
-    if not enterprise:
-        return jsonify({'error': enterpriseNotFoundErrStr}), 404
+    enterprise = g.enterprise
     
     # Get subscription details
     subscription = {
@@ -281,14 +328,16 @@ def subscription_status():
         }
     }
     
-    return render_template('enterprise/subscription.html', subscription=subscription)
+    return _conditional_page(
+        ('subscription', enterprise.id, enterprise.updated_at),
+        lambda: render_template('enterprise/subscription.html', subscription=subscription)
+    )
 
 @enterprise_bp.route('/subscription/upgrade', methods=['POST'])
 @jwt_required()
 @enterprise_required
 def upgrade_subscription():
-    identity = get_jwt_identity()
-    enterprise = Enterprise.query.get(identity['id'])
+    enterprise = load_enterprise(g.enterprise.id)
     
     if not enterprise:
         return jsonify({'error': enterpriseNotFoundErrStr}), 404
@@ -301,29 +350,23 @@ def upgrade_subscription():
     plan = data['plan']
     
     # Update subscription details based on the plan
-    if plan == 'basic':
-        enterprise.subscription_plan = 'basic'
-        enterprise.max_jobs_allowed = 5
-        enterprise.max_interviews_allowed = 20
-        enterprise.subscription_features = json.dumps(['Basic analytics', 'Standard AI interviews'])
-    elif plan == 'pro':
-        enterprise.subscription_plan = 'pro'
-        enterprise.max_jobs_allowed = 20
-        enterprise.max_interviews_allowed = 100
-        enterprise.subscription_features = json.dumps(['Advanced analytics', 'Custom AI behavior', 'Priority support'])
-    elif plan == 'enterprise':
-        enterprise.subscription_plan = 'enterprise'
-        enterprise.max_jobs_allowed = 100
-        enterprise.max_interviews_allowed = 500
-        enterprise.subscription_features = json.dumps(['Full analytics suite', 'Custom AI behavior', '24/7 support', 'API access', 'White labeling'])
-    else:
+    plan_config = PLAN_CONFIG.get(plan)
+    if plan_config is None:
         return jsonify({'error': 'Invalid plan selection'}), 400
     
+    enterprise.subscription_plan = plan
+    enterprise.max_jobs_allowed = plan_config['max_jobs_allowed']
+    enterprise.max_interviews_allowed = plan_config['max_interviews_allowed']
+    enterprise.subscription_features = _PLAN_FEATURES[plan]
+    
+    # Billing starts on the first of next month (relativedelta rolls December over into January)
+    now = datetime.now(timezone.utc)
     enterprise.subscription_status = 'active'
-    enterprise.next_billing_date = datetime.now(timezone.utc).replace(day=1).replace(month=datetime.now(timezone.utc).month + 1 if datetime.now(timezone.utc).month < 12 else 1)
-    enterprise.updated_at = datetime.now(timezone.utc)
+    enterprise.next_billing_date = now.replace(day=1) + relativedelta(months=1)
+    enterprise.updated_at = now
     
     db.session.commit()
+    invalidate_enterprise(enterprise.id)
     
     return jsonify({'message': 'Subscription upgraded successfully'}), 200
 
@@ -331,28 +374,33 @@ def upgrade_subscription():
 @jwt_required()
 @enterprise_required
 def view_candidates():
-    identity = get_jwt_identity()
-    enterprise = Enterprise.query.get(identity['id'])
-    
-    if not enterprise:
-        return jsonify({'error': enterpriseNotFoundErrStr}), 404
+    enterprise = g.enterprise
     
     # Get filters from query parameters
     job_id = request.args.get('job_id', type=int)
     min_score = request.args.get('min_score', type=float)
     skills = request.args.get('skills')
     
-    # Base query for applications to jobs owned by this enterprise
+    own_jobs = enterprise_jobs(enterprise.id)
+    
+    # Base query for applications to jobs owned by this enterprise; only the displayed columns
     query = db.session.query(
-        User, Application, Job, Interview
-    ).join(
+        User.id,
+        User.name,
+        User.email,
+        Job.title.label('job_title'),
+        Application.created_at.label('application_date'),
+        Application.status,
+        Interview.score.label('interview_score'),
+        Interview.created_at.label('interview_date')
+    ).select_from(User).join(
         Application, User.id == Application.user_id
     ).join(
         Job, Application.job_id == Job.id
     ).outerjoin(
         Interview, (Application.user_id == Interview.user_id) & (Application.job_id == Interview.job_id)
-    ).filter(
-        Job.enterprise_id == enterprise.id
+    ).options(
+        own_jobs
     )
     
     # Apply filters
@@ -363,31 +411,21 @@ def view_candidates():
         query = query.filter(Interview.score >= min_score)
     
     if skills:
-        skill_list = skills.split(',')
-        # This assumes a skills JSON field in User or related Skills table
-        for skill in skill_list:
-            query = query.filter(User.skills.contains(skill.strip()))
-    
-    candidates = query.all()
-    
-    # Format candidates for display
-    formatted_candidates = []
-    for user, application, job, interview in candidates:
-        candidate_data = {
-            'id': user.id,
-            'name': user.name,
-            'email': user.email,
-            'job_title': job.title,
-            'application_date': application.created_at,
-            'status': application.status,
-            'interview_score': interview.score if interview else None,
-            'interview_date': interview.created_at if interview else None
-        }
-        formatted_candidates.append(candidate_data)
-    
-    # Get all jobs for filter dropdown
-    jobs = Job.query.filter_by(enterprise_id=enterprise.id).all()
+        skill_list = [skill.strip() for skill in skills.split(',') if skill.strip()]
+        # One JSONB containment test for all skills, served by the GIN index
+        if skill_list:
+            query = query.filter(User.profile_data['skills'].contains(skill_list))
+    
+    # All jobs for the filter dropdown
+    jobs = Job.query.options(load_only(Job.id, Job.title), own_jobs).all()
+    
+    # Stream rows from a server-side cursor in batches of 500 and render as they
+    # arrive, so large candidate lists are never held in memory all at once
+    candidates = (
+        candidate._asdict()
+        for candidate in query.execution_options(stream_results=True, yield_per=500)
+    )
     
-    return render_template('enterprise/candidates.html', 
-                           candidates=formatted_candidates, 
+    return stream_template('enterprise/candidates.html',
+                           candidates=candidates,
                            jobs=jobs)
\ No newline at end of file
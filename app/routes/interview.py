@@ -1,15 +1,23 @@
-import base64
-from flask import Blueprint, request, jsonify, render_template, current_app
+from flask import Blueprint, request, jsonify, render_template, current_app, g, Response, send_from_directory
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from app.models import Interview, User, Enterprise, Job, Application, InterviewQuestion, db
+from app.models import Interview, User, Job, Application, InterviewQuestion, db
 from app.services.gemini_service import GeminiService
 from app.services.scoring_service import ScoringService
-from app.services.tts_service import TTSService
 from app.services.stt_service import STTService
-from app.utils.decorators import enterprise_required
+from app.services.tts_service import get_tts_service
+from app.utils.decorators import enterprise_required, user_required
+from app.utils.concurrency import run_concurrently
+from app.utils.audio_storage import (
+    PRESIGNED_UPLOAD_EXPIRES, direct_uploads_enabled, presign_answer_upload,
+    is_answer_key, open_answer_audio
+)
+from app.tasks import generate_question_audio_task
 from datetime import datetime, timezone
-import json
-import uuid
+from sqlalchemy import select, update, func, literal
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+from sqlalchemy.orm import defaultload, joinedload, lazyload, contains_eager, selectinload, undefer, load_only
+import hashlib
+import secrets
 import os
 from dotenv import load_dotenv
 
@@ -20,11 +28,144 @@ gemini_api_key = os.getenv('GEMINI_API_KEY')
 interview_bp = Blueprint('interview', __name__, url_prefix='/interview')
 gemini_service = GeminiService(gemini_api_key)
 scoring_service = ScoringService(gemini_service)
-tts_service = TTSService()
 stt_service = STTService()
 errorHtmlPage = 'error.html'
-userNotFoundErrStr = "User not found"
-enterpriseNotFoundStr = "Enterprise not found"
+
+def _audio_path(shard, filename):
+    """Place an audio file under UPLOAD_FOLDER/audio/<shard[:2]>/<shard[2:4]>/ so no directory grows unbounded."""
+    return os.path.join(current_app.config['UPLOAD_FOLDER'], 'audio', shard[:2], shard[2:4], filename)
+
+def _question_audio_path(audio_key):
+    # Keys are sha256 digests, so their leading hex digits spread files evenly
+    return _audio_path(audio_key, f"{audio_key}.mp3")
+
+def _answer_audio_path(question_id):
+    # Shard on the low 16 bits: sequential ids then fan out across all subdirectories
+    return _audio_path(f"{question_id & 0xffff:04x}", f"answer_{question_id}.webm")
+
+def _queue_question_audio(question):
+    """Point a question at its audio file, pre-rendering it when the TTS provider cannot stream."""
+    voice_id = current_app.config.get('TTS_VOICE_ID')
+    # Content-addressed: the same text and voice (e.g. a job's must-ask questions) share one file
+    question.audio_key = hashlib.sha256(f"{voice_id or 'default'}|{question.question}".encode()).hexdigest()
+    audio_path = _question_audio_path(question.audio_key)
+    if not get_tts_service().can_stream and not os.path.exists(audio_path):
+        generate_question_audio_task.delay(question.question, audio_path, voice_id)
+
+def _question_with_interview(question_id, with_job=False):
+    """Load a question joined to its interview (and optionally the job), without the interview's question list."""
+    options = [joinedload(InterviewQuestion.interview).lazyload(Interview.questions)]
+    if with_job:
+        options.append(defaultload(InterviewQuestion.interview).joinedload(Interview.job))
+    return InterviewQuestion.query.options(*options).filter_by(id=question_id).first()
+
+def _question_history(interview_id):
+    """Return an interview's (question, answer, score, is_must_ask) rows, oldest first, without building ORM objects."""
+    return db.session.execute(
+        select(InterviewQuestion.question, InterviewQuestion.answer,
+               InterviewQuestion.score, InterviewQuestion.is_must_ask)
+        .where(InterviewQuestion.interview_id == interview_id)
+        .order_by(InterviewQuestion.created_at)
+    ).all()
+
+def _split_history(rows):
+    """Split history rows into the question, answer and score lists the summary prompts take, in one pass."""
+    question_texts, answers, scores = [], [], []
+    for row in rows:
+        question_texts.append(row.question)
+        answers.append(row.answer or '')
+        if row.score:
+            scores.append(row.score)
+    return question_texts, answers, scores
+
+def _refresh_transcript(interview_id):
+    """
+    Rewrite an interview's transcript from its question rows in one SQL UPDATE.
+
+    Every question gets a Q/A entry, oldest first; unanswered (or empty)
+    answers read 'Not answered'. Rebuilding the whole text keeps re-submitted
+    answers current, and the database does it without loading the rows here.
+    Pending ORM changes (e.g. the answer just set) are flushed first.
+    """
+    entry = func.concat(
+        'Q: ', InterviewQuestion.question,
+        '\nA: ', func.coalesce(func.nullif(InterviewQuestion.answer, ''), 'Not answered')
+    )
+    transcript = (
+        select(func.string_agg(entry, aggregate_order_by(
+            literal('\n\n'), InterviewQuestion.created_at, InterviewQuestion.id
+        )))
+        .where(InterviewQuestion.interview_id == interview_id)
+        .scalar_subquery()
+    )
+    db.session.flush()
+    db.session.execute(
+        update(Interview)
+        .where(Interview.id == interview_id)
+        .values(transcript=transcript)
+        .execution_options(synchronize_session=False)
+    )
+
+def _transcribe_answer_audio(question, data):
+    """
+    Transcribe an answer recording sent with the request.
+    
+    Accepts an 'audio_key' previously issued by a presign endpoint (the
+    client uploaded to S3 directly), a multipart upload in the 'audio'
+    field, or a raw audio body (audio/* or application/octet-stream).
+    The audio is decoded and transcribed as it is read; uploads through
+    this server are also kept on disk as answer_<question id>.webm.
+    
+    Args:
+        question: The InterviewQuestion being answered
+        data: The parsed JSON or form fields of the request
+        
+    Returns:
+        The transcribed text, or None if no audio was sent
+    """
+    audio_path = _answer_audio_path(question.id)
+    
+    audio_key = data.get('audio_key')
+    if audio_key and direct_uploads_enabled() and is_answer_key(question.id, audio_key):
+        # Already stored in the bucket; stream it from there
+        audio_stream, audio_path = open_answer_audio(audio_key), None
+    elif 'audio' in request.files:
+        audio_stream = request.files['audio'].stream
+    elif request.mimetype.startswith('audio/') or request.mimetype == 'application/octet-stream':
+        audio_stream = request.stream
+    else:
+        return None
+    
+    if audio_path:
+        os.makedirs(os.path.dirname(audio_path), exist_ok=True)
+    result = stt_service.transcribe_stream(audio_stream, archive_path=audio_path)
+    return result.get('text', '')
+
+@interview_bp.route('/audio/stream/<int:question_id>', methods=['GET'])
+def stream_question_audio(question_id):
+    """Stream a question's audio so playback starts with the first synthesized chunk"""
+    question = InterviewQuestion.query.options(
+        load_only(InterviewQuestion.question, InterviewQuestion.audio_key)
+    ).filter_by(id=question_id).first()
+    
+    if not question or not question.audio_key:
+        return jsonify({'error': 'Audio not found'}), 404
+    
+    audio_path = _question_audio_path(question.audio_key)
+    if os.path.exists(audio_path):
+        return send_from_directory(os.path.dirname(audio_path), os.path.basename(audio_path),
+                                   mimetype='audio/mpeg')
+    
+    # Not rendered yet: stream from the provider and keep a copy for the next request
+    os.makedirs(os.path.dirname(audio_path), exist_ok=True)
+    return Response(
+        get_tts_service().stream_audio(
+            question.question,
+            current_app.config.get('TTS_VOICE_ID'),
+            cache_path=audio_path
+        ),
+        mimetype='audio/mpeg'
+    )
 
 # General interview routes
 @interview_bp.route('/interviews', methods=['GET'])
@@ -33,12 +174,11 @@ def list_interviews():
     identity = get_jwt_identity()
     
     if identity['type'] == 'user':
-        # Get user's interviews
-        user = User.query.get(identity['id'])
-        if not user:
-            return jsonify({'error': userNotFoundErrStr}), 404
-        
-        interviews = Interview.query.filter_by(user_id=user.id).all()
+        # Get user's interviews (the token carries the id, so no User lookup);
+        # job comes in on the same query (LEFT OUTER JOIN: general assessments have none)
+        interviews = Interview.query.options(
+            joinedload(Interview.job)
+        ).filter_by(user_id=identity['id']).all()
         
         interview_list = [{
             'id': interview.id,
@@ -51,16 +191,16 @@ def list_interviews():
         return render_template('user/interviews.html', interviews=interview_list)
     
     elif identity['type'] == 'enterprise':
-        # Get enterprise's interviews
-        enterprise = Enterprise.query.get(identity['id'])
-        if not enterprise:
-            return jsonify({'error': enterpriseNotFoundStr}), 404
-        
-        # Get jobs owned by the enterprise
-        job_ids = [job.id for job in Job.query.filter_by(enterprise_id=enterprise.id).all()]
-        
-        # Get interviews associated with those jobs
-        interviews = Interview.query.filter(Interview.job_id.in_(job_ids)).all()
+        # Get enterprise's interviews; the token's id is the enterprise id, as for users above
+        # Interviews for the enterprise's jobs, with job and candidate loaded in the same query
+        interviews = Interview.query.join(
+            Interview.job
+        ).options(
+            contains_eager(Interview.job),
+            joinedload(Interview.user)
+        ).filter(
+            Job.enterprise_id == identity['id']
+        ).all()
         
         interview_list = [{
             'id': interview.id,
@@ -79,7 +219,13 @@ def list_interviews():
 @jwt_required()
 def get_interview_details(interview_id):
     identity = get_jwt_identity()
-    interview = Interview.query.get(interview_id)
+    # One JOIN for user and job plus one IN query for the (ordered) questions
+    interview = Interview.query.options(
+        joinedload(Interview.user),
+        joinedload(Interview.job),
+        selectinload(Interview.questions),
+        undefer(Interview.transcript)
+    ).filter_by(id=interview_id).first()
     
     if not interview:
         return jsonify({'error': 'Interview not found'}), 404
@@ -88,16 +234,9 @@ def get_interview_details(interview_id):
     if identity['type'] == 'user' and interview.user_id != identity['id']:
         return jsonify({'error': 'Not authorized to view this interview'}), 403
     
-    if identity['type'] == 'enterprise':
-        # Check if enterprise owns the job associated with the interview
-        enterprise = Enterprise.query.get(identity['id'])
-        job = Job.query.get(interview.job_id)
-        
-        if not job or job.enterprise_id != enterprise.id:
-            return jsonify({'error': 'Not authorized to view this interview'}), 403
-    
-    # Get interview questions and answers
-    questions = InterviewQuestion.query.filter_by(interview_id=interview.id).order_by(InterviewQuestion.created_at).all()
+    # Enterprises may only view interviews for their own jobs
+    if identity['type'] == 'enterprise' and (not interview.job or interview.job.enterprise_id != identity['id']):
+        return jsonify({'error': 'Not authorized to view this interview'}), 403
     
     # Format interview data
     interview_data = {
@@ -123,7 +262,7 @@ def get_interview_details(interview_id):
             'answer': q.answer,
             'score': q.score,
             'feedback': q.feedback
-        } for q in questions]
+        } for q in interview.questions]
     }
     
     # Return different templates based on user type
@@ -134,14 +273,10 @@ def get_interview_details(interview_id):
 
 # User general assessment interviews
 @interview_bp.route('/assessment/start', methods=['POST'])
-@jwt_required()
+@user_required
 def start_general_assessment():
     """Start a general AI assessment interview without a specific job"""
-    identity = get_jwt_identity()
-    user = User.query.get(identity['id'])
-    
-    if not user:
-        return jsonify({'error': userNotFoundErrStr}), 404
+    user = g.user
     
     data = request.get_json()
     
@@ -153,46 +288,42 @@ def start_general_assessment():
     job_interest = data.get('job_interest', '')
     additional_info = data.get('additional_info', '')
     
-    # Create a new interview record
+    # Generate initial question based on CV and job interest
+    initial_question = gemini_service.generate_initial_question(
+        cv_path=user.cv_path,
+        job_interest=job_interest,
+        additional_info=additional_info
+    )
+    
+    # Create a new interview record; flush assigns its id without a separate commit
     new_interview = Interview(
         user_id=user.id,
         job_id=None,  # General assessment, not tied to a specific job
         status='in_progress',
-        created_at=datetime.now(timezone.utc),
         interview_type='general_assessment',
-        additional_data=json.dumps({
+        additional_data={
             'job_interest': job_interest,
             'additional_info': additional_info
-        })
+        }
     )
     
     db.session.add(new_interview)
-    db.session.commit()
-    
-    # Generate initial question based on CV and job interest
-    initial_question = gemini_service.generate_initial_question(
-        cv_path=user.cv_path,
-        job_interest=job_interest,
-        additional_info=additional_info
-    )
+    db.session.flush()
     
     # Store the first question
     question = InterviewQuestion(
         interview_id=new_interview.id,
-        question=initial_question,
-        created_at=datetime.now(timezone.utc)
+        question=initial_question
     )
     
+    # Audio is shared by identical questions; audio_url streams it as it is synthesized
+    if current_app.config.get('ENABLE_TTS', False):
+        _queue_question_audio(question)
+    
     db.session.add(question)
     db.session.commit()
     
-    # Generate audio for the question (if needed)
-    audio_url = None
-    if current_app.config.get('ENABLE_TTS', False):
-        audio_filename = f"question_{question.id}.mp3"
-        audio_path = os.path.join(current_app.config['UPLOAD_FOLDER'], 'audio', audio_filename)
-        tts_service.generate_audio(initial_question, audio_path)
-        audio_url = f"/audio/{audio_filename}"
+    audio_url = question.audio_url
     
     return jsonify({
         'interview_id': new_interview.id,
@@ -201,96 +332,115 @@ def start_general_assessment():
         'audio_url': audio_url
     }), 201
 
-@interview_bp.route('/assessment/answer/<int:question_id>', methods=['POST'])
+@interview_bp.route('/assessment/audio/presign/<int:question_id>', methods=['POST'])
 @jwt_required()
-def submit_answer(question_id):
-    """Submit an answer to a question in an ongoing interview"""
+def presign_answer_audio(question_id):
+    """Issue a pre-signed URL to upload an answer recording directly to S3"""
     identity = get_jwt_identity()
-    user = User.query.get(identity['id'])
     
-    if not user:
-        return jsonify({'error': userNotFoundErrStr}), 404
+    question = InterviewQuestion.query.get(question_id)
+    
+    if not question:
+        return jsonify({'error': 'Question not found'}), 404
+    
+    interview = Interview.query.get(question.interview_id)
+    
+    if not interview or interview.user_id != identity['id']:
+        return jsonify({'error': 'Not authorized to answer this question'}), 403
+    
+    if not direct_uploads_enabled():
+        return jsonify({'error': 'Direct audio uploads are not configured'}), 501
+    
+    audio_key, upload_url = presign_answer_upload(question.id, request.args.get('content_type', 'audio/webm'))
+    return jsonify({
+        'audio_key': audio_key,
+        'upload_url': upload_url,
+        'expires_in': PRESIGNED_UPLOAD_EXPIRES
+    }), 200
+
+@interview_bp.route('/assessment/answer/<int:question_id>', methods=['POST'])
+@user_required
+def submit_answer(question_id):
+    """Submit an answer to a question in an ongoing interview"""
+    user = g.user
     
     # Get the question
-    question = InterviewQuestion.query.get(question_id)
+    question = _question_with_interview(question_id)
     
     if not question:
         return jsonify({'error': 'Question not found'}), 404
     
     # Check if the question belongs to the user's interview
-    interview = Interview.query.get(question.interview_id)
+    interview = question.interview
     
     if not interview or interview.user_id != user.id:
         return jsonify({'error': 'Not authorized to answer this question'}), 403
     
-    data = request.get_json()
+    data = request.get_json(silent=True) or request.form
     answer_text = data.get('answer', '')
     
     # If audio was sent, transcribe it
-    if 'audio' in data:
-        audio_data = data['audio']
-        # Assuming audio is sent as base64
-        audio_filename = f"answer_{question.id}.webm"
-        audio_path = os.path.join(current_app.config['UPLOAD_FOLDER'], 'audio', audio_filename)
-        
-        # Save audio file
-        with open(audio_path, 'wb') as f:
-            f.write(base64.b64decode(audio_data))
-        
-        # Transcribe audio
-        answer_text = stt_service.transcribe_audio(audio_path)
+    spoken_answer = _transcribe_answer_audio(question, data)
+    if spoken_answer is not None:
+        answer_text = spoken_answer
     
-    # Update the question with the answer
+    # Update the question with the answer, then its entry in the transcript
     question.answer = answer_text
     question.answered_at = datetime.now(timezone.utc)
+    _refresh_transcript(interview.id)
     
-    # Score the answer
-    score, feedback = scoring_service.score_answer(
-        question=question.question,
-        answer=answer_text,
-        cv_path=user.cv_path,
-        job_interest=json.loads(interview.additional_data).get('job_interest', '')
-    )
+    job_interest = (interview.additional_data or {}).get('job_interest', '')
+    current_question = question.question
     
-    question.score = score
-    question.feedback = feedback
+    def score_current_answer():
+        return scoring_service.score_answer(
+            question=current_question,
+            answer=answer_text,
+            cv_path=user.cv_path,
+            job_interest=job_interest
+        )
     
-    db.session.commit()
+    # Committed together with the next question (or by finish_interview)
     
-    # Check if we should continue the interview or finish it
-    questions_count = InterviewQuestion.query.filter_by(interview_id=interview.id).count()
+    # Fetch the interview's questions once; count and history are derived from this list
+    all_questions = _question_history(interview.id)
     
-    if questions_count >= 10:  # Limit to 10 questions per interview
+    # Check if we should continue the interview or finish it
+    if len(all_questions) >= 10:  # Limit to 10 questions per interview
+        question.score, question.feedback = score_current_answer()
         # Generate next steps
         return finish_interview(interview.id)
     
-    # Generate the next question
-    next_question_text = gemini_service.generate_follow_up_question(
-        cv_path=user.cv_path,
-        job_interest=json.loads(interview.additional_data).get('job_interest', ''),
-        previous_questions=[q.question for q in InterviewQuestion.query.filter_by(interview_id=interview.id).all()],
-        previous_answers=[q.answer for q in InterviewQuestion.query.filter_by(interview_id=interview.id).all() if q.answer],
-        current_question=question.question,
-        current_answer=answer_text
+    # Scoring and the follow-up question are independent LLM calls, so run them side by side
+    (score, feedback), next_question_text = run_concurrently(
+        score_current_answer,
+        lambda: gemini_service.generate_follow_up_question(
+            cv_path=user.cv_path,
+            job_interest=job_interest,
+            previous_questions=[q.question for q in all_questions],
+            previous_answers=[q.answer for q in all_questions if q.answer],
+            current_question=current_question,
+            current_answer=answer_text
+        )
     )
     
+    question.score = score
+    question.feedback = feedback
+    
     # Store the next question
     next_question = InterviewQuestion(
         interview_id=interview.id,
-        question=next_question_text,
-        created_at=datetime.now(timezone.utc)
+        question=next_question_text
     )
     
+    # Audio is shared by identical questions; audio_url streams it as it is synthesized
+    if current_app.config.get('ENABLE_TTS', False):
+        _queue_question_audio(next_question)
+    
     db.session.add(next_question)
     db.session.commit()
     
-    # Generate audio for the question (if needed)
-    audio_url = None
-    if current_app.config.get('ENABLE_TTS', False):
-        audio_filename = f"question_{next_question.id}.mp3"
-        audio_path = os.path.join(current_app.config['UPLOAD_FOLDER'], 'audio', audio_filename)
-        tts_service.generate_audio(next_question_text, audio_path)
-        audio_url = f"/audio/{audio_filename}"
+    audio_url = next_question.audio_url
     
     return jsonify({
         'question_id': next_question.id,
@@ -301,48 +451,39 @@ def submit_answer(question_id):
     }), 200
 
 @interview_bp.route('/assessment/finish/<int:interview_id>', methods=['POST'])
-@jwt_required()
+@user_required
 def finish_interview(interview_id):
     """Finish an interview and generate the final assessment"""
-    identity = get_jwt_identity()
-    user = User.query.get(identity['id'])
-    
-    if not user:
-        return jsonify({'error': userNotFoundErrStr}), 404
+    user = g.user
     
-    # Get the interview
-    interview = Interview.query.get(interview_id)
+    # Get the interview; its question list is read below as plain rows instead
+    interview = db.session.get(Interview, interview_id, options=[lazyload(Interview.questions)])
     
     if not interview or interview.user_id != user.id:
         return jsonify({'error': 'Not authorized to finish this interview'}), 403
     
     # Check if there are any questions
-    questions = InterviewQuestion.query.filter_by(interview_id=interview.id).all()
+    questions = _question_history(interview.id)
     
     if not questions:
         return jsonify({'error': 'No questions found for this interview'}), 400
     
-    # Generate transcript
-    transcript = "\n\n".join([
-        f"Q: {q.question}\nA: {q.answer if q.answer else 'Not answered'}"
-        for q in questions
-    ])
-    
     # Generate summary and overall score
-    job_interest = json.loads(interview.additional_data).get('job_interest', '')
+    job_interest = (interview.additional_data or {}).get('job_interest', '')
     
+    question_texts, answers, scores = _split_history(questions)
     summary, overall_score = gemini_service.generate_interview_summary(
         cv_path=user.cv_path,
         job_interest=job_interest,
-        questions=[q.question for q in questions],
-        answers=[q.answer if q.answer else '' for q in questions],
-        scores=[q.score for q in questions if q.score]
+        questions=question_texts,
+        answers=answers,
+        scores=scores
     )
     
-    # Update the interview record
+    # Update the interview record; the transcript also lists questions left unanswered
+    _refresh_transcript(interview.id)
     interview.status = 'completed'
     interview.ended_at = datetime.now(timezone.utc)
-    interview.transcript = transcript
     interview.summary = summary
     interview.score = overall_score
     
@@ -362,11 +503,7 @@ def finish_interview(interview_id):
 @enterprise_required
 def setup_job_interview(job_id):
     """Setup interview configuration for a specific job"""
-    identity = get_jwt_identity()
-    enterprise = Enterprise.query.get(identity['id'])
-    
-    if not enterprise:
-        return jsonify({'error': enterpriseNotFoundStr}), 404
+    enterprise = g.enterprise
     
     # Check if job exists and belongs to this enterprise
     job = Job.query.get(job_id)
@@ -405,11 +542,7 @@ def setup_job_interview(job_id):
 @enterprise_required
 def invite_candidate(job_id):
     """Send interview invitation to a candidate"""
-    identity = get_jwt_identity()
-    enterprise = Enterprise.query.get(identity['id'])
-    
-    if not enterprise:
-        return jsonify({'error': enterpriseNotFoundStr}), 404
+    enterprise = g.enterprise
     
     # Check if job exists and belongs to this enterprise
     job = Job.query.get(job_id)
@@ -430,13 +563,14 @@ def invite_candidate(job_id):
         candidate = User(
             email=data['candidate_email'],
             name=data.get('candidate_name', 'Candidate'),
-            password_hash=str(uuid.uuid4()),  # Random password, will be reset on first login
+            password_hash=None,  # No login until the candidate sets a password
             created_at=datetime.now(timezone.utc),
             is_active=False,
             is_temp_account=True
         )
         db.session.add(candidate)
-        db.session.commit()
+        # Assign candidate.id for the application; committed with it below
+        db.session.flush()
     
     # Check if candidate has already applied to this job
     application = Application.query.filter_by(
@@ -449,8 +583,7 @@ def invite_candidate(job_id):
         application = Application(
             user_id=candidate.id,
             job_id=job.id,
-            status='invited',
-            created_at=datetime.now(timezone.utc)
+            status='invited'
         )
         db.session.add(application)
     else:
@@ -458,7 +591,7 @@ def invite_candidate(job_id):
         application.updated_at = datetime.now(timezone.utc)
     
     # Generate interview token
-    interview_token = str(uuid.uuid4())
+    interview_token = secrets.token_urlsafe(24)
     
     # Schedule the interview
     scheduled_time = data.get('scheduled_time')
@@ -480,14 +613,22 @@ def invite_candidate(job_id):
         'application_id': application.id
     }), 200
 
+def _application_for_token(job_id, token):
+    """Find the application invited with token (unique index), with its job and candidate in the same query."""
+    application = Application.query.options(
+        joinedload(Application.job),
+        joinedload(Application.user)
+    ).filter_by(interview_token=token).first()
+    
+    if not application or application.job_id != job_id:
+        return None
+    return application
+
 @interview_bp.route('/job/<int:job_id>/token/<token>', methods=['GET'])
 def join_job_interview(job_id, token):
     """Access job interview with a token"""
     # Verify the token
-    application = Application.query.filter_by(
-        job_id=job_id,
-        interview_token=token
-    ).first()
+    application = _application_for_token(job_id, token)
     
     if not application:
         return render_template(errorHtmlPage, message='Invalid interview token'), 404
@@ -506,12 +647,9 @@ def join_job_interview(job_id, token):
     if existing_interview:
         return render_template(errorHtmlPage, message='You have already completed an interview for this job'), 400
     
-    # Get job and user details
-    job = Job.query.get(job_id)
-    user = User.query.get(application.user_id)
-    
-    if not job or not user:
-        return render_template(errorHtmlPage, message='Job or user not found'), 404
+    # Loaded with the application
+    job = application.job
+    user = application.user
     
     # Prepare for interview
     return render_template('interview/job_interview.html', 
@@ -524,10 +662,7 @@ def join_job_interview(job_id, token):
 def start_job_interview(job_id, token):
     """Start the actual job interview with a token"""
     # Verify the token
-    application = Application.query.filter_by(
-        job_id=job_id,
-        interview_token=token
-    ).first()
+    application = _application_for_token(job_id, token)
     
     if not application:
         return jsonify({'error': 'Invalid interview token'}), 404
@@ -536,29 +671,9 @@ def start_job_interview(job_id, token):
     if application.interview_token_expiry and application.interview_token_expiry < datetime.now(timezone.utc):
         return jsonify({'error': 'Interview token has expired'}), 400
     
-    # Get job and user details
-    job = Job.query.get(job_id)
-    user = User.query.get(application.user_id)
-    
-    if not job or not user:
-        return jsonify({'error': 'Job or user not found'}), 404
-    
-    # Create a new interview record
-    new_interview = Interview(
-        user_id=user.id,
-        job_id=job.id,
-        status='in_progress',
-        created_at=datetime.now(timezone.utc),
-        interview_type='job_specific'
-    )
-    
-    db.session.add(new_interview)
-    db.session.commit()
-    
-    # Update application status
-    application.status = 'interviewing'
-    application.updated_at = datetime.now(timezone.utc)
-    db.session.commit()
+    # Loaded with the application
+    job = application.job
+    user = application.user
     
     # Generate initial question based on job description and interview settings
     interview_settings = job.interview_settings if job.interview_settings else {}
@@ -576,24 +691,36 @@ def start_job_interview(job_id, token):
             is_first_question=True
         )
     
+    # Create a new interview record; flush assigns its id without a separate commit
+    new_interview = Interview(
+        user_id=user.id,
+        job_id=job.id,
+        status='in_progress',
+        interview_type='job_specific'
+    )
+    
+    db.session.add(new_interview)
+    db.session.flush()
+    
+    # Update application status
+    application.status = 'interviewing'
+    application.updated_at = datetime.now(timezone.utc)
+    
     # Store the first question
     question = InterviewQuestion(
         interview_id=new_interview.id,
         question=initial_question_text,
-        created_at=datetime.now(timezone.utc),
         is_must_ask=len(must_ask_questions) > 0
     )
     
+    # Audio is shared by identical questions; audio_url streams it as it is synthesized
+    if current_app.config.get('ENABLE_TTS', False):
+        _queue_question_audio(question)
+    
     db.session.add(question)
     db.session.commit()
     
-    # Generate audio for the question (if needed)
-    audio_url = None
-    if current_app.config.get('ENABLE_TTS', False):
-        audio_filename = f"question_{question.id}.mp3"
-        audio_path = os.path.join(current_app.config['UPLOAD_FOLDER'], 'audio', audio_filename)
-        tts_service.generate_audio(initial_question_text, audio_path)
-        audio_url = f"/audio/{audio_filename}"
+    audio_url = question.audio_url
     
     return jsonify({
         'interview_id': new_interview.id,
@@ -603,125 +730,149 @@ def start_job_interview(job_id, token):
         'remaining_time': interview_settings.get('time_limit', 30) * 60  # Convert minutes to seconds
     }), 201
 
+@interview_bp.route('/job/interview/audio/presign/<int:question_id>', methods=['POST'])
+def presign_job_interview_answer_audio(question_id):
+    """Issue a pre-signed URL to upload a job interview answer recording directly to S3"""
+    question = _question_with_interview(question_id, with_job=False)
+    
+    if not question:
+        return jsonify({'error': 'Question not found'}), 404
+    
+    # Loaded with the question
+    interview = question.interview
+    
+    if not interview or interview.interview_type != 'job_specific':
+        return jsonify({'error': 'Invalid interview type'}), 400
+    
+    # Only the invited candidate may upload, with the token from their invitation
+    token = (request.get_json(silent=True) or {}).get('token') or request.args.get('token')
+    application = _application_for_token(interview.job_id, token) if token else None
+    
+    if not application or application.user_id != interview.user_id:
+        return jsonify({'error': 'Invalid interview token'}), 404
+    
+    if application.interview_token_expiry and application.interview_token_expiry < datetime.now(timezone.utc):
+        return jsonify({'error': 'Interview token has expired'}), 400
+    
+    if interview.status == 'completed':
+        return jsonify({'error': 'Interview is already completed'}), 400
+    
+    if not direct_uploads_enabled():
+        return jsonify({'error': 'Direct audio uploads are not configured'}), 501
+    
+    audio_key, upload_url = presign_answer_upload(question.id, request.args.get('content_type', 'audio/webm'))
+    return jsonify({
+        'audio_key': audio_key,
+        'upload_url': upload_url,
+        'expires_in': PRESIGNED_UPLOAD_EXPIRES
+    }), 200
+
 # Endpoint similar to general assessment answer but specifically for job interviews
 @interview_bp.route('/job/interview/answer/<int:question_id>', methods=['POST'])
 def submit_job_interview_answer(question_id):
     """Submit an answer to a question in a job interview"""
     # Get the question
-    question = InterviewQuestion.query.get(question_id)
+    question = _question_with_interview(question_id, with_job=True)
     
     if not question:
         return jsonify({'error': 'Question not found'}), 404
     
-    # Get the interview
-    interview = Interview.query.get(question.interview_id)
+    # Loaded with the question
+    interview = question.interview
     
     if not interview or interview.interview_type != 'job_specific':
         return jsonify({'error': 'Invalid interview type'}), 400
     
-    # Get the job
-    job = Job.query.get(interview.job_id)
+    job = interview.job
     
     if not job:
         return jsonify({'error': 'Job not found'}), 404
     
-    data = request.get_json()
+    data = request.get_json(silent=True) or request.form
     answer_text = data.get('answer', '')
     
     # If audio was sent, transcribe it
-    if 'audio' in data:
-        audio_data = data['audio']
-        # Assuming audio is sent as base64
-        audio_filename = f"answer_{question.id}.webm"
-        audio_path = os.path.join(current_app.config['UPLOAD_FOLDER'], 'audio', audio_filename)
-        
-        # Save audio file
-        with open(audio_path, 'wb') as f:
-            f.write(base64.b64decode(audio_data))
-        
-        # Transcribe audio
-        answer_text = stt_service.transcribe_audio(audio_path)
+    spoken_answer = _transcribe_answer_audio(question, data)
+    if spoken_answer is not None:
+        answer_text = spoken_answer
     
-    # Update the question with the answer
+    # Update the question with the answer, then its entry in the transcript
     question.answer = answer_text
     question.answered_at = datetime.now(timezone.utc)
+    _refresh_transcript(interview.id)
     
-    # Score the answer
     interview_settings = job.interview_settings if job.interview_settings else {}
-    score, feedback = scoring_service.score_job_interview_answer(
-        question=question.question,
-        answer=answer_text,
-        job_description=job.description,
-        job_requirements=job.requirements,
-        interview_settings=interview_settings
-    )
+    current_question = question.question
     
-    question.score = score
-    question.feedback = feedback
+    def score_current_answer():
+        return scoring_service.score_job_interview_answer(
+            question=current_question,
+            answer=answer_text,
+            job_description=job.description,
+            job_requirements=job.requirements,
+            interview_settings=interview_settings
+        )
     
-    db.session.commit()
+    # Committed together with the next question (or by finish_job_interview)
     
-    # Check if we should continue the interview or finish it
-    questions_count = InterviewQuestion.query.filter_by(interview_id=interview.id).count()
+    # Fetch the interview's questions once; counts, must-ask progress and history come from this list
+    all_questions = _question_history(interview.id)
     must_ask_questions = interview_settings.get('must_ask_questions', [])
-    answered_must_ask = InterviewQuestion.query.filter_by(
-        interview_id=interview.id,
-        is_must_ask=True,
-        answer=None  # Not null
-    ).count()
+    answered_must_ask = sum(1 for q in all_questions if q.is_must_ask and q.answer)
     
     # Check if we've reached the maximum number of questions or all must-ask questions are answered
-    if questions_count >= 15 or (len(must_ask_questions) > 0 and answered_must_ask == len(must_ask_questions)):
+    if len(all_questions) >= 15 or (len(must_ask_questions) > 0 and answered_must_ask == len(must_ask_questions)):
+        question.score, question.feedback = score_current_answer()
         # Finish the interview
         return finish_job_interview(interview.id)
     
     # Generate the next question
     
     # If there are remaining must-ask questions, use the next one
-    remaining_must_ask = [q for q in must_ask_questions if q not in [
-        question.question for question in InterviewQuestion.query.filter_by(
-            interview_id=interview.id, 
-            is_must_ask=True
-        ).all()
-    ]]
+    asked_must_ask = {q.question for q in all_questions if q.is_must_ask}
+    remaining_must_ask = [q for q in must_ask_questions if q not in asked_must_ask]
     
     if remaining_must_ask:
+        score, feedback = score_current_answer()
         next_question_text = remaining_must_ask[0]
         is_must_ask = True
     else:
-        # Generate a follow-up question using AI
-        previous_questions = [q.question for q in InterviewQuestion.query.filter_by(interview_id=interview.id).all()]
-        previous_answers = [q.answer for q in InterviewQuestion.query.filter_by(interview_id=interview.id).all() if q.answer]
+        # Generate a follow-up question using AI, alongside scoring since neither needs the other
+        previous_questions = [q.question for q in all_questions]
+        previous_answers = [q.answer for q in all_questions if q.answer]
         
-        next_question_text = gemini_service.generate_job_interview_follow_up(
-            job_description=job.description,
-            job_requirements=job.requirements,
-            interview_settings=interview_settings,
-            previous_questions=previous_questions,
-            previous_answers=previous_answers,
-            current_question=question.question,
-            current_answer=answer_text
+        (score, feedback), next_question_text = run_concurrently(
+            score_current_answer,
+            lambda: gemini_service.generate_job_interview_follow_up(
+                job_description=job.description,
+                job_requirements=job.requirements,
+                interview_settings=interview_settings,
+                previous_questions=previous_questions,
+                previous_answers=previous_answers,
+                current_question=current_question,
+                current_answer=answer_text
+            )
         )
         is_must_ask = False
     
+    question.score = score
+    question.feedback = feedback
+    
     # Store the next question
     next_question = InterviewQuestion(
         interview_id=interview.id,
         question=next_question_text,
-        created_at=datetime.now(timezone.utc),
         is_must_ask=is_must_ask
     )
     
+    # Audio is shared by identical questions; audio_url streams it as it is synthesized
+    if current_app.config.get('ENABLE_TTS', False):
+        _queue_question_audio(next_question)
+    
     db.session.add(next_question)
     db.session.commit()
     
-    # Generate audio for the question (if needed)
-    audio_url = None
-    if current_app.config.get('ENABLE_TTS', False):
-        audio_filename = f"question_{next_question.id}.mp3"
-        audio_path = os.path.join(current_app.config['UPLOAD_FOLDER'], 'audio', audio_filename)
-        tts_service.generate_audio(next_question_text, audio_path)
-        audio_url = f"/audio/{audio_filename}"
+    audio_url = next_question.audio_url
     
     return jsonify({
         'question_id': next_question.id,
@@ -734,46 +885,43 @@ def submit_job_interview_answer(question_id):
 @interview_bp.route('/job/interview/finish/<int:interview_id>', methods=['POST'])
 def finish_job_interview(interview_id):
     """Finish a job interview and generate the final assessment"""
-    # Get the interview
-    interview = Interview.query.get(interview_id)
+    # Get the interview with its job; its question list is read below as plain rows instead
+    interview = db.session.get(Interview, interview_id, options=[
+        lazyload(Interview.questions),
+        joinedload(Interview.job)
+    ])
     
     if not interview or interview.interview_type != 'job_specific':
         return jsonify({'error': 'Invalid interview'}), 404
     
-    # Get the job
-    job = Job.query.get(interview.job_id)
+    job = interview.job
     
     if not job:
         return jsonify({'error': 'Job not found'}), 404
     
     # Get all questions and answers
-    questions = InterviewQuestion.query.filter_by(interview_id=interview.id).all()
+    questions = _question_history(interview.id)
     
     if not questions:
         return jsonify({'error': 'No questions found for this interview'}), 400
     
-    # Generate transcript
-    transcript = "\n\n".join([
-        f"Q: {q.question}\nA: {q.answer if q.answer else 'Not answered'}"
-        for q in questions
-    ])
-    
     # Generate summary and overall score
     interview_settings = job.interview_settings if job.interview_settings else {}
     
+    question_texts, answers, scores = _split_history(questions)
     summary, overall_score = gemini_service.evaluate_job_interview(
         job_description=job.description,
         job_requirements=job.requirements,
         interview_settings=interview_settings,
-        questions=[q.question for q in questions],
-        answers=[q.answer if q.answer else '' for q in questions],
-        scores=[q.score for q in questions if q.score]
+        questions=question_texts,
+        answers=answers,
+        scores=scores
     )
     
-    # Update the interview record
+    # Update the interview record; the transcript also lists questions left unanswered
+    _refresh_transcript(interview.id)
     interview.status = 'completed'
     interview.ended_at = datetime.now(timezone.utc)
-    interview.transcript = transcript
     interview.summary = summary
     interview.score = overall_score
     
@@ -1,10 +1,15 @@
 from flask import Blueprint, request, jsonify, render_template, current_app, g
 from flask_jwt_extended import jwt_required, get_jwt_identity, get_jwt
 from app.models import db, User, Job, Application, Enterprise, Interview
+from app.utils.decorators import get_request_data
+from sqlalchemy import tuple_, func, select, exists
+from sqlalchemy.orm import joinedload, contains_eager
+from app import redis_client
 import app.services.scoring_service as ss
 import app.utils.recommender as recommender
-from app.utils.file_parser import extract_skills_from_text, extract_text_from_pdf, parse_cv
+from app.utils.file_parser import parse_cv_cached, cv_fingerprint
 import os
+import hashlib
 from datetime import datetime, timezone
 from werkzeug.utils import secure_filename
 import uuid
@@ -14,17 +19,64 @@ from dotenv import load_dotenv
 load_dotenv()
 job_bp = Blueprint('job', __name__, url_prefix='/jobs')
 appJsonStr = 'application/json'
+JOB_COUNT_CACHE_TIMEOUT = 60
 
 gemini_service = GeminiService(os.getenv('GEMINI_API_KEY'))
 scoring_service = ss.ScoringService()
 recommender_service = recommender.RecommenderSystem()
 
+def get_user_skills(user):
+    """
+    Return the skills extracted from a user's CV, re-parsing only when the CV changed.
+    
+    Skills are stored on the user row with the CV's hash at upload time; a
+    stale or missing entry is refreshed and committed here.
+    
+    Args:
+        user: The User whose CV to read
+        
+    Returns:
+        List of skills, empty if the user has no readable CV
+    """
+    if not user.cv_path:
+        return []
+    
+    try:
+        fingerprint = cv_fingerprint(user.cv_path)
+    except FileNotFoundError:
+        return user.cached_skills or []
+    
+    if user.cached_skills is not None and user.cached_skills_cv_hash == fingerprint:
+        return user.cached_skills
+    
+    skills = parse_cv_cached(user.cv_path)['skills']
+    user.cached_skills = skills
+    user.cached_skills_cv_hash = fingerprint
+    db.session.commit()
+    return skills
+
+def _cached_job_count(query):
+    """Count the jobs matching a filtered query, cached briefly per filter set instead of counted on every page view"""
+    filters = sorted((key, value) for key, value in request.args.items()
+                     if key not in ('per_page', 'after_created_at', 'after_id'))
+    key = f"jobs:count:{hashlib.sha1(repr(filters).encode()).hexdigest()}"
+    
+    cached = redis_client.get(key)
+    if cached is not None:
+        return int(cached)
+    
+    total = query.order_by(None).count()
+    redis_client.set(key, total, ex=JOB_COUNT_CACHE_TIMEOUT)
+    return total
+
 @job_bp.route('/', methods=['GET'])
 def list_jobs():
-    """List all active job postings with optional filtering"""
-    # Handle query parameters for filtering
-    page = request.args.get('page', 1, type=int)
-    per_page = request.args.get('per_page', 10, type=int)
+    """List active job postings, newest first, with optional filtering and cursor pagination"""
+    per_page = max(1, min(request.args.get('per_page', 10, type=int), 100))
+    
+    # Keyset cursor: the (created_at, id) of the last job on the previous page
+    after_created_at = request.args.get('after_created_at')
+    after_id = request.args.get('after_id', type=int)
     
     # Filter parameters
     location = request.args.get('location')
@@ -34,7 +86,7 @@ def list_jobs():
     enterprise_id = request.args.get('enterprise_id', type=int)
     
     # Start with base query
-    query = Job.query.filter_by(active=True)
+    query = Job.query.filter(Job.status == 'active')
     
     # Apply filters if provided
     if location:
@@ -42,75 +94,87 @@ def list_jobs():
     if role_type:
         query = query.filter_by(job_type=role_type)
     if keyword:
-        query = query.filter(
-            (Job.title.ilike(f'%{keyword}%')) | 
-            (Job.description.ilike(f'%{keyword}%')) |
-            (Job.skills_required.ilike(f'%{keyword}%'))
-        )
+        # GIN full-text index instead of a sequential ILIKE scan
+        query = query.filter(Job.search_tsv.op('@@')(func.plainto_tsquery('english', keyword)))
     if experience_level:
         query = query.filter_by(experience_level=experience_level)
     if enterprise_id:
         query = query.filter_by(enterprise_id=enterprise_id)
     
-    # Order by most recent
-    query = query.order_by(Job.created_at.desc())
+    filtered_query = query
+    
+    # Seek past the cursor instead of OFFSET, so deep pages cost the same as the first
+    if after_created_at and after_id:
+        try:
+            cursor_ts = datetime.fromisoformat(after_created_at)
+        except ValueError:
+            return jsonify({'error': 'Invalid after_created_at cursor'}), 400
+        query = query.filter(tuple_(Job.created_at, Job.id) < tuple_(cursor_ts, after_id))
+    
+    # Order by most recent; one extra row tells whether another page exists
+    jobs = query.order_by(Job.created_at.desc(), Job.id.desc()).limit(per_page + 1).all()
+    has_more = len(jobs) > per_page
+    jobs = jobs[:per_page]
     
-    # Paginate results
-    jobs_pagination = query.paginate(page=page, per_page=per_page)
-    jobs = jobs_pagination.items
+    next_cursor = None
+    if has_more:
+        next_cursor = {
+            'after_created_at': jobs[-1].created_at.isoformat(),
+            'after_id': jobs[-1].id
+        }
     
     # For API requests
     if request.headers.get('Accept') == appJsonStr:
         return jsonify({
             'jobs': [job.to_dict() for job in jobs],
-            'total': jobs_pagination.total,
-            'pages': jobs_pagination.pages,
-            'current_page': page
+            'next_cursor': next_cursor
         })
     
     # For web requests
     return render_template(
         'jobs/list.html',
         jobs=jobs,
-        pagination=jobs_pagination
+        next_cursor=next_cursor,
+        total=_cached_job_count(filtered_query)
     )
 
 @job_bp.route('/<int:job_id>', methods=['GET'])
+@jwt_required(optional=True)
 def view_job(job_id):
     """View a specific job posting"""
-    job = Job.query.get_or_404(job_id)
+    # The enterprise comes in on the same query
+    job = Job.query.options(joinedload(Job.enterprise)).filter_by(id=job_id).first_or_404()
     
     # Check if job is still active
-    if not job.active:
+    if job.status != 'active':
         return render_template('jobs/closed.html', job=job), 404
     
-    # Get the associated enterprise
-    enterprise = Enterprise.query.get(job.enterprise_id)
+    enterprise = job.enterprise
     
     # Check if user is logged in and has a match score
     user_match_score = None
     already_applied = False
-    user_id = None
     
-    try:
-        user_id = get_jwt_identity()
-        if user_id:
-            # Check if user already applied
-            application = Application.query.filter_by(
-                user_id=user_id,
-                job_id=job_id
-            ).first()
-            already_applied = application is not None
-            
-            # Get match score if user has CV
-            user = User.query.get(user_id)
-            if user and user.cv_path:
-                user_cv_text = extract_text_from_pdf(user.cv_path) if user.cv_path.endswith('.pdf') else user.cv_path
-                user_skills = extract_skills_from_text(user_cv_text)
-                user_match_score = scoring_service.calculate_job_match_score(user_skills, job.skills_required)
-    except Exception:
-        # Not logged in or token issues, continue as guest
-        pass
+    # Guests have no token and no identity; enterprises have no match score
+    identity = get_jwt_identity()
+    if identity and identity.get('type') == 'user':
+        user_id = identity['id']
+        # The user and whether they already applied, in one round trip
+        row = db.session.execute(
+            select(
+                User,
+                exists().where(
+                    Application.user_id == user_id,
+                    Application.job_id == job_id
+                ).label('applied')
+            ).where(User.id == user_id)
+        ).first()
+        user, already_applied = row if row else (None, False)
+        
+        # Get match score if user has CV
+        if user and user.cv_path:
+            user_skills = get_user_skills(user)
+            user_match_score = scoring_service.calculate_job_match_score(user_skills, job.skills_required_tokens)
     
     # For API requests
     if request.headers.get('Accept') == appJsonStr:
@@ -145,7 +209,7 @@ def create_job():
         return jsonify({'error': 'Enterprise account not found'}), 404
     
     if request.method == 'POST':
-        data = request.form or request.get_json()
+        data = get_request_data()
         
         # Create new job with provided data
         new_job = Job(
@@ -202,7 +266,7 @@ def update_job(job_id):
     if request.method == 'GET':
         return render_template('jobs/update.html', job=job)
     
-    data = request.form or request.get_json()
+    data = get_request_data()
     
     # Update job fields
     job.title = data['title'] if data['title'] else job.title
@@ -274,7 +338,7 @@ def apply_job(job_id):
     user = User.query.get_or_404(user_id)
     
     # Check if job is still active
-    if not job.active:
+    if job.status != 'active':
         return jsonify({'error': 'This job posting is no longer active'}), 400
     
     # Check if already applied
@@ -306,8 +370,7 @@ def apply_job(job_id):
             job_id=job_id,
             cv_path=cv_path,
             cover_letter=data.get('cover_letter', ''),
-            status='pending',
-            applied_at=datetime.now(timezone.utc)
+            status='pending'
         )
         
         db.session.add(application)
@@ -342,11 +405,7 @@ def recommended_jobs():
     user = User.query.get_or_404(user_id)
     
     # Get user skills from CV if available
-    user_skills = []
-    if user.cv_path and os.path.exists(user.cv_path):
-        # Extract skills from CV
-        user_cv_text = extract_text_from_pdf(user.cv_path)
-        user_skills = extract_skills_from_text(user_cv_text)
+    user_skills = get_user_skills(user)
     
     # Get recommended jobs
     recommended = recommender_service.recommend_jobs_for_user(user_id, user_skills)
@@ -376,9 +435,9 @@ def job_match_analysis(job_id):
     if not user.cv_path:
         return jsonify({'error': 'Please upload your CV first to get a match analysis'}), 400
     
-    # Extract skills from CV
-    user_cv = parse_cv(user.cv_path) if user.cv_path.endswith('.pdf') else user.cv_path
-    user_skills = extract_skills_from_text(user_cv["skills"])
+    # Skills come from the user row; the full parse (for Gemini) from the per-file cache
+    user_cv = parse_cv_cached(user.cv_path)
+    user_skills = get_user_skills(user)
     
     # Use Gemini to analyze the match
     analysis = gemini_service.analyze_cv_for_job(
@@ -387,7 +446,7 @@ def job_match_analysis(job_id):
     )
     
     # Calculate match score
-    match_score = scoring_service.calculate_job_match_score(user_skills, job.skills_required)
+    match_score = scoring_service.calculate_job_match_score(user_skills, job.skills_required_tokens)
     
     response = {
         'match_score': match_score,
@@ -416,14 +475,16 @@ def user_applications():
     """View all job applications for a user"""
     user_id = get_jwt_identity()
     
-    # Get all applications for this user
-    applications = Application.query.filter_by(user_id=user_id).order_by(Application.applied_at.desc()).all()
+    # Get all applications for this user, with each job and its enterprise in the same query
+    applications = Application.query.options(
+        joinedload(Application.job).joinedload(Job.enterprise)
+    ).filter_by(user_id=user_id).order_by(Application.created_at.desc()).all()
     
     # Prepare data with job details
     application_data = []
     for app in applications:
-        job = Job.query.get(app.job_id)
-        enterprise = Enterprise.query.get(job.enterprise_id) if job else None
+        job = app.job
+        enterprise = job.enterprise if job else None
         
         application_data.append({
             'application': app,
@@ -458,18 +519,21 @@ def manage_applications():
     
     enterprise_id = get_jwt_identity()
     
-    # Get jobs posted by this enterprise
-    jobs = Job.query.filter_by(enterprise_id=enterprise_id).all()
-    job_ids = [job.id for job in jobs]
-    
-    # Get applications for these jobs
-    applications = Application.query.filter(Application.job_id.in_(job_ids)).order_by(Application.applied_at.desc()).all()
+    # Get applications for this enterprise's jobs, with the job and candidate in the same query
+    applications = Application.query.join(
+        Application.job
+    ).options(
+        contains_eager(Application.job),
+        joinedload(Application.user)
+    ).filter(
+        Job.enterprise_id == enterprise_id
+    ).order_by(Application.created_at.desc()).all()
     
     # Group applications by job
     grouped_applications = {}
     for app in applications:
-        job = Job.query.get(app.job_id)
-        user = User.query.get(app.user_id)
+        job = app.job
+        user = app.user
         
         if app.job_id not in grouped_applications:
             grouped_applications[app.job_id] = {
@@ -517,7 +581,7 @@ def update_application_status(application_id):
     if not job or job.enterprise_id != enterprise_id:
         return jsonify({'error': 'You do not have permission to update this application'}), 403
     
-    data = request.form or request.get_json()
+    data = get_request_data()
     new_status = data.get('status')
     
     if not new_status:
@@ -1,29 +1,24 @@
 from flask import Blueprint, render_template, redirect, url_for, request, jsonify, current_app
 from flask_jwt_extended import jwt_required, get_jwt_identity, get_jwt
 from app.models import User, Interview, Job, Enterprise, db
+from sqlalchemy import func, select
+from sqlalchemy.orm import joinedload
+from app.utils.decorators import cache_response
 
 main_bp = Blueprint('main', __name__)
+# Platform totals don't need to be exact to the second
+STATS_CACHE_TIMEOUT = 60
 
 @main_bp.route('/')
+@jwt_required(optional=True)
 def index():
     """Home page route"""
     # Get recent job postings for the homepage
     recent_jobs = Job.query.order_by(Job.created_at.desc()).limit(6).all()
     
-    # Check if user is logged in
-    logged_in = False
-    user_role = None
-    
-    try:
-        # Try to get JWT identity (will fail if not logged in)
-        user_id = get_jwt_identity()
-        if user_id:
-            logged_in = True
-            claims = get_jwt()
-            user_role = claims.get('role', 'user')
-    except Exception:
-        # Not logged in, continue as guest
-        pass
+    # Check if user is logged in; guests have no token and no identity
+    logged_in = bool(get_jwt_identity())
+    user_role = get_jwt().get('role', 'user') if logged_in else None
     
     return render_template(
         'main/index.html', 
@@ -84,15 +79,16 @@ def faq():
     return render_template('main/faq.html')
 
 @main_bp.route('/api/stats')
+@cache_response(timeout=STATS_CACHE_TIMEOUT, key_prefix='platform_stats')
 def api_stats():
     """Public API endpoint for platform statistics"""
-    # Get basic platform stats
-    stats = {
-        'total_users': User.query.count(),
-        'total_enterprises': Enterprise.query.count(),
-        'total_jobs': Job.query.count(),
-        'total_interviews': Interview.query.count()
-    }
+    # Get basic platform stats, all four counts in one round trip
+    counts = db.session.execute(select(
+        *(select(func.count()).select_from(model).scalar_subquery()
+          for model in (User, Enterprise, Job, Interview))
+    )).one()
+    
+    stats = dict(zip(('total_users', 'total_enterprises', 'total_jobs', 'total_interviews'), counts))
     
     return jsonify(stats)
 
@@ -106,10 +102,14 @@ def search():
     
     if query:
         if category == 'jobs':
-            # Search jobs
-            job_results = Job.query.filter(
-                (Job.title.ilike(f'%{query}%')) | 
-                (Job.description.ilike(f'%{query}%'))
+            # Search jobs through the full-text index, best matches first
+            ts_query = func.plainto_tsquery('english', query)
+            job_results = Job.query.options(
+                joinedload(Job.enterprise)
+            ).filter(
+                Job.search_tsv.op('@@')(ts_query)
+            ).order_by(
+                func.ts_rank(Job.search_tsv, ts_query).desc()
             ).limit(20).all()
             
             results = [{
@@ -122,7 +122,7 @@ def search():
             } for job in job_results]
         
         elif category == 'enterprises':
-            # Search enterprises
+            # Search enterprises (ILIKE is served by the trigram index on name)
             enterprise_results = Enterprise.query.filter(
                 Enterprise.name.ilike(f'%{query}%')
             ).limit(20).all()
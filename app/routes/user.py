@@ -2,7 +2,7 @@
 Routes for handling user operations like profile management and CV uploads.
 """
 
-from flask import Blueprint, request, jsonify, current_app
+from flask import Blueprint, request, jsonify, current_app, url_for
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from werkzeug.utils import secure_filename
 import os
@@ -10,7 +10,8 @@ import json
 
 from app import db
 from app.models import User
-from app.utils.file_parser import save_uploaded_file, parse_cv, FileUploadError
+from app.utils.file_parser import save_uploaded_file, FileUploadError
+from app.tasks import parse_cv_task
 
 user = Blueprint('user', __name__)
 notFoundErrorStr = "User not found"
@@ -95,38 +96,30 @@ def upload_cv():
         return jsonify({"error": "No selected file"}), 400
     
     try:
-        # Save the file
+        # Save the file; parsing runs in the background
         file_path, new_filename = save_uploaded_file(file, directory='cvs')
         
-        # Parse the CV
-        cv_data = parse_cv(file_path)
-        
-        # Update user profile with CV data
-        profile_data = user.profile_data or {}
-        
         # Store CV file path
+        profile_data = dict(user.profile_data or {})
         profile_data['cv_filename'] = new_filename
         profile_data['cv_path'] = file_path
         
-        # Update profile with extracted data if not already set
-        if 'skills' not in profile_data or not profile_data['skills']:
-            profile_data['skills'] = cv_data['skills']
-            
-        if 'education' not in profile_data or not profile_data['education']:
-            profile_data['education'] = cv_data['education']
-            
-        if 'experience' not in profile_data or not profile_data['experience']:
-            profile_data['experience'] = cv_data['experience']
-        
         # Update the user
         user.profile_data = profile_data
+        user.cv_path = file_path
+        user.cv_present = True
         db.session.commit()
         
+        # The worker fills skills, education and experience, then emits 'cv_parsed' to the user
+        task = parse_cv_task.delay(user.id, file_path)
+        
         return jsonify({
-            "message": "CV uploaded and parsed successfully",
-            "cv_data": cv_data,
-            "profile_data": profile_data
-        })
+            "message": "CV uploaded, parsing started",
+            "status": "processing",
+            "cv_path": file_path,
+            "task_id": task.id,
+            "status_url": url_for('user.cv_status', task_id=task.id)
+        }), 202
         
     except FileUploadError as e:
         return jsonify({"error": str(e)}), 400
@@ -134,6 +127,31 @@ def upload_cv():
         current_app.logger.error(f"Error uploading CV: {str(e)}")
         return jsonify({"error": "Failed to process CV"}), 500
 
+@user.route('/cvs/status/<task_id>', methods=['GET'])
+@jwt_required()
+def cv_status(task_id):
+    """Check on a CV parsing task"""
+    identity = get_jwt_identity()
+    result = parse_cv_task.AsyncResult(task_id)
+    
+    if result.failed():
+        return jsonify({"status": "failed", "error": "Failed to process CV"}), 500
+    
+    if not result.successful():
+        return jsonify({"status": result.state.lower()}), 202
+    
+    payload = result.result
+    # The task stores the owner's integer id; tokens carry {'id': ..., 'type': ...}
+    if identity.get('type') != 'user' or payload.get('user_id') != identity['id']:
+        return jsonify({"error": "CV not found or access denied"}), 404
+    
+    return jsonify({
+        "status": "completed",
+        "cv_path": payload['cv_path'],
+        "cv_data": payload['cv_data'],
+        "profile_data": payload['profile_data']
+    })
+
 @user.route('/cvs', methods=['GET'])
 @jwt_required()
 def get_user_cvs():
@@ -9,23 +9,33 @@ This module provides functions to interact with the Gemini API for:
 """
 import os
 import json
+import functools
 
 import google.generativeai
 from flask import current_app
 import google.generativeai as genai
 from typing import Dict, List, Tuple, Any, Optional
-from dotenv import load_dotenv
 
-load_dotenv()
+
+@functools.lru_cache(maxsize=1)
+def get_gemini() -> 'GeminiService':
+    """Return the process-wide GeminiService, built on first use from app config.
+
+    Created lazily so the key comes from the loaded Flask config and each
+    forked worker builds (and reuses) its own client.
+    """
+    return GeminiService(api_key=current_app.config.get('GEMINI_API_KEY'))
 
 
 class GeminiService:
     def __init__(self, api_key: str=None) -> None:
-        # load_dotenv()
         """Initialize the Gemini service with API key."""
         self.api_key = api_key or os.environ.get('GEMINI_API_KEY')
         if not self.api_key:
             raise ValueError("Gemini API key not provided and not found in environment or app config")
+        # Configure once: genai.configure drops the SDK's cached clients, so
+        # calling it per request would open a fresh connection every time
+        genai.configure(api_key=self.api_key)
 
     def _make_request(self, prompt: str, parameters: google.generativeai.GenerationConfig = None, system_prompt: str = "") -> str:
         """Make a request to the Gemini API.
@@ -46,7 +56,6 @@ class GeminiService:
                 response_mime_type="application/json"
             )
 
-        genai.configure(api_key=self.api_key)
         model = genai.GenerativeModel(
             model_name="gemini-2.0-flash-exp",
             generation_config=parameters
@@ -3,13 +3,21 @@ Scoring Service for Automated HR
 Handles all interview scoring logic and assessment processing
 """
 import logging
+import functools
 from typing import Dict, List, Tuple, Optional
 import json
+from app import redis_client
 from app.models import Interview, User, Job
-from app.services.gemini_service import GeminiService
+from app.services.gemini_service import GeminiService, get_gemini
+from app.utils.skills import normalize_skills
 
 logger = logging.getLogger(__name__)
 
+@functools.lru_cache(maxsize=1)
+def get_scoring_service() -> 'ScoringService':
+    """Return the process-wide ScoringService, built on first use inside an app context."""
+    return ScoringService(get_gemini())
+
 class ScoringService:
     """
     Service to handle interview scoring and evaluation
@@ -337,23 +345,52 @@ class ScoringService:
             'comparative_stats': comparative_stats
         }
         
-    def calculate_job_match_score(self, user_skills: list[str], required_skills: list[str]) -> int:
+    def cached_feedback_report(self, interview: Interview, timeout: int = 86400) -> Dict:
+        """
+        Return the feedback report for an interview, reusing a cached copy.
+        
+        The cache key carries the interview's score and end time, so
+        re-scoring or re-running the interview yields a fresh report.
+        
+        Args:
+            interview: The (already loaded) interview
+            timeout: Cache lifetime in seconds
+            
+        Returns:
+            Dict containing the detailed feedback
+        """
+        if interview.score is None:
+            # The report scores the interview first; cache once it has a score
+            return self.generate_feedback_report(interview.id)
+        
+        end_time = interview.end_time.isoformat() if interview.end_time else ''
+        key = f"feedback_report:{interview.id}:{interview.score}:{end_time}"
+        
+        cached = redis_client.get(key)
+        if cached:
+            return json.loads(cached)
+        
+        report = self.generate_feedback_report(interview.id)
+        redis_client.set(key, json.dumps(report, default=str), ex=timeout)
+        return report
+        
+    def calculate_job_match_score(self, user_skills: list[str], required_tokens: list[str]) -> int:
         """
         Calculate a match score for a job based on user skills
         
         Args:
-            user_skills: List of skills the user possesses
-            required_skills: List of skills required for the job
+            user_skills: List of skills the user possesses (normalized here)
+            required_tokens: The job's skills_required_tokens, already normalized
             
         Returns:
             Match score (0-100)
         """
-        if not required_skills:
+        if not required_tokens:
             return 100
 
         if not user_skills:
             return 0
-        matched_skills = set(user_skills) & set(required_skills)
-        match_score = len(matched_skills) / len(required_skills) * 100
+        matched_skills = set(normalize_skills(user_skills)).intersection(required_tokens)
+        match_score = len(matched_skills) / len(required_tokens) * 100
         return round(match_score)
         
\ No newline at end of file
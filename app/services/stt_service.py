@@ -5,6 +5,8 @@ Using SpeechRecognition library instead of external APIs
 """
 import logging
 import os
+import subprocess
+import threading
 import tempfile
 from typing import Optional, Dict, BinaryIO
 import speech_recognition as sr
@@ -124,6 +126,66 @@ class STTService:
             logger.error(f"Error decoding base64 audio: {str(e)}")
             return {"error": str(e), "text": ""}
             
+    def transcribe_stream(self, audio_stream: BinaryIO, language: str = "en-US",
+                          archive_path: Optional[str] = None, chunk_size: int = 65536) -> Dict:
+        """
+        Transcribe compressed audio (webm, ogg, mp3...) while it is still being read
+        
+        The stream is piped through ffmpeg into 16 kHz mono PCM as it arrives,
+        so decoding overlaps the upload and the audio is never written to disk
+        just to be read back.
+        
+        Args:
+            audio_stream: File-like object yielding the encoded audio (e.g. request.stream)
+            language: Language code (default: "en-US")
+            archive_path: If set, the encoded bytes are also copied to this file
+            chunk_size: Bytes read from the stream at a time
+            
+        Returns:
+            Dict containing the transcription and metadata
+        """
+        try:
+            ffmpeg = subprocess.Popen(
+                ['ffmpeg', '-loglevel', 'error', '-i', 'pipe:0',
+                 '-ar', '16000', '-ac', '1', '-f', 's16le', 'pipe:1'],
+                stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE
+            )
+        except OSError as e:
+            logger.error(f"Could not start ffmpeg: {str(e)}")
+            return {"error": str(e), "text": ""}
+        
+        def feed():
+            archive = open(archive_path, "wb") if archive_path else None
+            try:
+                for chunk in iter(lambda: audio_stream.read(chunk_size), b""):
+                    ffmpeg.stdin.write(chunk)
+                    if archive:
+                        archive.write(chunk)
+            except (BrokenPipeError, OSError) as e:
+                # ffmpeg exited early; its stderr explains why
+                logger.warning(f"Stopped feeding audio to ffmpeg: {str(e)}")
+            finally:
+                ffmpeg.stdin.close()
+                if archive:
+                    archive.close()
+        
+        # Feed and drain concurrently so neither pipe buffer fills up and blocks
+        feeder = threading.Thread(target=feed, daemon=True)
+        feeder.start()
+        pcm = ffmpeg.stdout.read()
+        feeder.join()
+        errors = ffmpeg.stderr.read().decode(errors="replace")
+        
+        if ffmpeg.wait() != 0 or not pcm:
+            logger.error(f"Error decoding audio stream: {errors.strip()}")
+            return {"error": errors.strip() or "No audio decoded", "text": ""}
+        
+        text = self._recognize_audio(sr.AudioData(pcm, 16000, 2), language)
+        return {
+            "text": text,
+            "language": language
+        }
+    
     def transcribe_audio_chunk(self, audio_data: bytes, language: str = "en-US") -> str:
         """
         Transcribe a small chunk of audio (for real-time transcription)
@@ -9,25 +9,43 @@ This module provides functionality for:
 import os
 import json
 import time
+import functools
 import tempfile
 import hashlib
 from typing import Dict, Optional, Tuple, BinaryIO
 import pyttsx3
+from flask import current_app
 import io
 from pathlib import Path
 import wave
 
+# Used for streaming when ElevenLabs is configured but no TTS_VOICE_ID is set
+ELEVENLABS_DEFAULT_VOICE = 'JBFqnCBsd6RMkjVDRZzb'
+ELEVENLABS_MODEL = 'eleven_flash_v2_5'
+
+@functools.lru_cache(maxsize=1)
+def get_tts_service() -> 'TTSService':
+    """Return the process-wide TTSService; its engine is initialized on first use."""
+    return TTSService(elevenlabs_api_key=current_app.config.get('ELEVENLABS_API_KEY'))
+
 class TTSService:
     """Service for Text-to-Speech conversion using pyttsx3 library."""
     
-    def __init__(self, provider="pyttsx3"):
+    def __init__(self, provider="pyttsx3", elevenlabs_api_key: str = None):
         """Initialize the TTS service.
         
         Args:
-            provider: The TTS engine provider (always "pyttsx3" for this implementation)
+            provider: The TTS engine provider for file output (always "pyttsx3" for this implementation)
+            elevenlabs_api_key: Optional ElevenLabs key; enables chunked streaming in stream_audio()
         """
         self.provider = provider
         
+        # Streaming provider (pyttsx3 can only render whole files)
+        self._elevenlabs = None
+        if elevenlabs_api_key:
+            from elevenlabs.client import ElevenLabs
+            self._elevenlabs = ElevenLabs(api_key=elevenlabs_api_key)
+        
         # Initialize the TTS engine
         self._engine = None  # Lazy initialization
         
@@ -188,6 +206,59 @@ class TTSService:
         
         return {"voices": formatted_voices}
     
+    @property
+    def can_stream(self) -> bool:
+        """Whether stream_audio() yields audio while it is still being synthesized."""
+        return self._elevenlabs is not None
+    
+    def stream_audio(self, text: str, voice_id: str = None, cache_path: str = None,
+                     chunk_size: int = 16384):
+        """Yield MP3 audio in chunks as the provider produces them.
+        
+        With ElevenLabs configured the first chunk arrives after a fraction of
+        the utterance is synthesized; otherwise the pyttsx3 render is chunked.
+        
+        Args:
+            text: The text to convert to speech
+            voice_id: Optional voice ID
+            cache_path: If set, the complete audio is also written here, so
+                        later requests can serve the file directly
+            chunk_size: Chunk size in bytes for the pyttsx3 fallback
+            
+        Yields:
+            Chunks of MP3 audio bytes
+        """
+        if self._elevenlabs is not None:
+            chunks = self._elevenlabs.text_to_speech.convert_as_stream(
+                voice_id or ELEVENLABS_DEFAULT_VOICE,
+                text=text,
+                model_id=ELEVENLABS_MODEL,
+                output_format='mp3_44100_128'
+            )
+        else:
+            audio_data, _ = self.text_to_speech(text, voice_id)
+            chunks = (audio_data[i:i + chunk_size] for i in range(0, len(audio_data), chunk_size))
+        
+        if cache_path is None:
+            yield from chunks
+            return
+        
+        # Write next to the target and rename at the end, so readers never see a partial file
+        partial_path = f"{cache_path}.{os.urandom(4).hex()}.part"
+        try:
+            with open(partial_path, 'wb') as f:
+                for chunk in chunks:
+                    f.write(chunk)
+                    yield chunk
+            os.replace(partial_path, cache_path)
+        except BaseException:
+            # Client disconnected (GeneratorExit) or synthesis failed: don't leave the partial file behind
+            try:
+                os.remove(partial_path)
+            except OSError:
+                pass
+            raise
+    
     def stream_audio_response(self, text: str, voice_id: str = None):
         """Create a streaming response for audio playback.
         
@@ -219,8 +290,11 @@ class TTSService:
         
         audio_data, _ = self.text_to_speech(text, voice_id, output_format=output_format)
         
-        with open(filepath, 'wb') as f:
+        # Write next to the target and rename at the end, so readers never see a partial file
+        partial_path = f"{filepath}.{os.urandom(4).hex()}.part"
+        with open(partial_path, 'wb') as f:
             f.write(audio_data)
+        os.replace(partial_path, filepath)
             
         return filepath
     
@@ -73,6 +73,9 @@ class InterviewSocketNamespace(Namespace):
             session['user_id'] = user_id
             session['role'] = role
             
+            # Per-user room for notifications pushed from background tasks
+            join_room(f"user_{user_id}")
+            
             logger.info(f"User {user_id} connected to interview socket")
             emit('connect_success', {'message': 'Connected to interview socket'})
             
@@ -0,0 +1,225 @@
+"""
+Background tasks for the Automated HR application.
+Long-running work (LLM calls, CV parsing) runs here instead of inside request handlers.
+"""
+import logging
+import os
+from collections import defaultdict
+from datetime import datetime
+from dateutil.relativedelta import relativedelta
+from celery import group
+from flask import current_app
+from flask_socketio import SocketIO
+from sqlalchemy import insert, delete, select, func
+
+from app import celery, db
+from app.models import CareerRoadmap, Interview, Application, Job, MonthlyActivity, User
+from app.services.gemini_service import get_gemini
+from app.services.tts_service import get_tts_service
+from app.utils.file_parser import parse_cv_cached, cv_fingerprint
+
+logger = logging.getLogger(__name__)
+
+def _notify_user(user_id, event, payload):
+    """Emit a Socket.IO event to a user's room through the shared message queue."""
+    message_queue = current_app.config.get('SOCKETIO_MESSAGE_QUEUE')
+    if not message_queue:
+        return
+    SocketIO(message_queue=message_queue).emit(
+        event, payload, to=f"user_{user_id}", namespace='/interview'
+    )
+
+def bulk_enqueue(task, arg_list, chunk_size=None):
+    """
+    Dispatch many calls of a task at once instead of one .delay() per item.
+
+    Args:
+        task: The Celery task to call
+        arg_list: Iterable of positional-argument tuples, one per call
+        chunk_size: If set, pack this many calls into each broker message
+                    (useful for very large batches, e.g. nightly re-runs)
+
+    Returns:
+        The GroupResult for the dispatched batch
+    """
+    if chunk_size:
+        return task.chunks(arg_list, chunk_size).apply_async()
+    return group(task.s(*args) for args in arg_list).apply_async()
+
+@celery.task(name='app.tasks.generate_roadmap_task')
+def generate_roadmap_task(user_id, cv_path, current_role, target_role, personality_traits):
+    """
+    Generate a career roadmap with Gemini and store it.
+
+    Args:
+        user_id: ID of the user the roadmap belongs to
+        cv_path: Path to the user's CV, or None
+        current_role: The user's current role
+        target_role: The role the user is aiming for
+        personality_traits: List of personality traits
+
+    Returns:
+        Dictionary with the owning user_id, the new roadmap_id and the roadmap data
+    """
+    cv_data = None
+    if cv_path:
+        try:
+            cv_data = parse_cv_cached(cv_path)
+        except FileNotFoundError:
+            logger.warning(f"CV for user {user_id} is missing at {cv_path}")
+
+    roadmap_data = get_gemini().generate_career_advice(
+        cv_data=cv_data,
+        career_interests=[target_role],
+        personality_traits=personality_traits,
+    )
+
+    # Core INSERT ... RETURNING: skips the ORM unit-of-work for a row we never reuse
+    roadmap_id = db.session.execute(
+        insert(CareerRoadmap).values(
+            user_id=user_id,
+            title=target_role or 'Career roadmap',
+            goals=roadmap_data.get('goals'),
+            recommended_skills=roadmap_data.get('recommended_skills'),
+            timeline=roadmap_data.get('timeline'),
+            current_role=current_role,
+            target_role=target_role
+        ).returning(CareerRoadmap.id)
+    ).scalar_one()
+    db.session.commit()
+    
+    from app.routes.careur import invalidate_roadmap_cache
+    invalidate_roadmap_cache(user_id)
+
+    result = {
+        'user_id': user_id,
+        'roadmap_id': roadmap_id,
+        'roadmap': roadmap_data
+    }
+
+    try:
+        _notify_user(user_id, 'roadmap_ready', result)
+    except Exception as e:
+        logger.error(f"Failed to emit roadmap_ready for user {user_id}: {str(e)}")
+
+    return result
+
+@celery.task(name='app.tasks.parse_cv_task')
+def parse_cv_task(user_id, cv_path):
+    """
+    Parse an uploaded CV and fill the user's profile from it.
+
+    Args:
+        user_id: ID of the user who uploaded the CV
+        cv_path: Path of the saved CV file
+
+    Returns:
+        Dictionary with the owning user_id, the cv_path, the parsed cv_data
+        and the resulting profile_data
+    """
+    cv_data = parse_cv_cached(cv_path)
+
+    user = db.session.get(User, user_id)
+    if user is None or user.cv_path != cv_path:
+        # Account removed, or a newer upload superseded this one
+        return {'user_id': user_id, 'cv_path': cv_path, 'cv_data': cv_data, 'profile_data': None}
+
+    profile_data = dict(user.profile_data or {})
+
+    # Update profile with extracted data if not already set
+    for field in ('skills', 'education', 'experience'):
+        if not profile_data.get(field):
+            profile_data[field] = cv_data[field]
+
+    user.profile_data = profile_data
+    # Job pages match against these instead of re-parsing the CV
+    user.cached_skills = cv_data['skills']
+    user.cached_skills_cv_hash = cv_fingerprint(cv_path)
+    db.session.commit()
+
+    result = {
+        'user_id': user_id,
+        'cv_path': cv_path,
+        'cv_data': cv_data,
+        'profile_data': profile_data
+    }
+
+    try:
+        _notify_user(user_id, 'cv_parsed', result)
+    except Exception as e:
+        logger.error(f"Failed to emit cv_parsed for user {user_id}: {str(e)}")
+
+    return result
+
+@celery.task(name='app.tasks.generate_question_audio_task')
+def generate_question_audio_task(text, audio_path, voice_id=None):
+    """
+    Synthesize a question's audio off the request path.
+
+    Args:
+        text: The question text to speak
+        audio_path: Where to write the audio file; it is served once it exists
+        voice_id: Optional TTS voice, the engine default when None
+
+    Returns:
+        The path of the written audio file
+    """
+    if os.path.exists(audio_path):
+        # Another request already rendered the same text
+        return audio_path
+    os.makedirs(os.path.dirname(audio_path), exist_ok=True)
+    return get_tts_service().save_audio_file(text, audio_path, voice_id=voice_id)
+
+@celery.task(name='app.tasks.refresh_monthly_activity')
+def refresh_monthly_activity(months=2):
+    """
+    Rebuild the MonthlyActivity rollup for the most recent months.
+
+    Older months no longer change, so the periodic run only recomputes the
+    current and previous month; pass a larger value once to backfill.
+
+    Args:
+        months: Number of months, counting the current one, to recompute
+
+    Returns:
+        Number of rollup rows written
+    """
+    start = (datetime.utcnow().replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+             - relativedelta(months=months - 1))
+
+    # (user_id, enterprise_id, month) -> [interview_count, application_count]
+    counts = defaultdict(lambda: [0, 0])
+
+    def collect(owner_column, created_column, index, per_user, join=None):
+        """Add one grouped count per (owner, month) into counts[...][index]."""
+        month = func.date_trunc('month', created_column)
+        stmt = select(owner_column, month, func.count()).where(created_column >= start)
+        if join is not None:
+            stmt = stmt.join_from(*join)
+        for owner_id, month_start, count in db.session.execute(stmt.group_by(owner_column, month)):
+            key = (owner_id, None) if per_user else (None, owner_id)
+            counts[key + (month_start.date(),)][index] = count
+
+    collect(Interview.user_id, Interview.created_at, 0, per_user=True)
+    collect(Application.user_id, Application.created_at, 1, per_user=True)
+    collect(Job.enterprise_id, Interview.created_at, 0, per_user=False,
+            join=(Interview, Job, Interview.job_id == Job.id))
+    collect(Job.enterprise_id, Application.created_at, 1, per_user=False,
+            join=(Application, Job, Application.job_id == Job.id))
+
+    # Replace the window in one transaction so readers never see it half-built
+    db.session.execute(delete(MonthlyActivity).where(MonthlyActivity.month >= start.date()))
+    if counts:
+        db.session.execute(insert(MonthlyActivity), [
+            {
+                'user_id': user_id,
+                'enterprise_id': enterprise_id,
+                'month': month,
+                'interview_count': interview_count,
+                'application_count': application_count
+            }
+            for (user_id, enterprise_id, month), (interview_count, application_count) in counts.items()
+        ])
+    db.session.commit()
+
+    return len(counts)
@@ -0,0 +1,81 @@
+"""
+Object storage for interview answer recordings.
+Clients upload recordings straight to S3 with a pre-signed URL, so the web
+worker never carries the audio bytes itself.
+"""
+import functools
+import uuid
+import boto3
+from flask import current_app
+
+PRESIGNED_UPLOAD_EXPIRES = 300
+
+
+@functools.lru_cache(maxsize=1)
+def get_s3_client():
+    """Return the process-wide S3 client (boto3 clients are thread-safe)."""
+    return boto3.client('s3', region_name=current_app.config.get('AWS_REGION'))
+
+
+def direct_uploads_enabled():
+    """Whether answer recordings can be uploaded straight to S3."""
+    return bool(current_app.config.get('AUDIO_UPLOAD_BUCKET'))
+
+
+def _answer_prefix(question_id):
+    return f"answers/{question_id}/"
+
+
+def presign_answer_upload(question_id, content_type='audio/webm'):
+    """
+    Create a short-lived URL the client can PUT an answer recording to.
+
+    Args:
+        question_id: ID of the question being answered
+        content_type: Content type the client will upload with
+
+    Returns:
+        Tuple of (audio_key, upload_url)
+    """
+    audio_key = f"{_answer_prefix(question_id)}{uuid.uuid4().hex}"
+    upload_url = get_s3_client().generate_presigned_url(
+        'put_object',
+        Params={
+            'Bucket': current_app.config['AUDIO_UPLOAD_BUCKET'],
+            'Key': audio_key,
+            'ContentType': content_type
+        },
+        ExpiresIn=PRESIGNED_UPLOAD_EXPIRES
+    )
+    return audio_key, upload_url
+
+
+def is_answer_key(question_id, audio_key):
+    """
+    Check that an object key was issued for this question.
+
+    Args:
+        question_id: ID of the question being answered
+        audio_key: Object key sent back by the client
+
+    Returns:
+        True if the key belongs to the question's upload prefix
+    """
+    prefix = _answer_prefix(question_id)
+    return (isinstance(audio_key, str) and audio_key.startswith(prefix)
+            and '/' not in audio_key[len(prefix):])
+
+
+def open_answer_audio(audio_key):
+    """
+    Open an uploaded answer recording for reading without downloading it first.
+
+    Args:
+        audio_key: Object key of the recording
+
+    Returns:
+        A file-like streaming body
+    """
+    return get_s3_client().get_object(
+        Bucket=current_app.config['AUDIO_UPLOAD_BUCKET'], Key=audio_key
+    )['Body']
@@ -0,0 +1,34 @@
+"""
+Concurrent query helpers for the Automated HR application.
+Lets a view issue independent database queries in parallel instead of one round trip after another.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from flask import current_app
+
+# Shared by all requests; each query holds one pooled DB connection while it runs
+_executor = ThreadPoolExecutor(max_workers=16, thread_name_prefix='query')
+
+
+def run_concurrently(*queries):
+    """
+    Run independent query callables in parallel.
+
+    Each callable runs in its own app context, and therefore with its own
+    db.session and connection. Returned ORM objects are detached once their
+    context ends: only attributes loaded by the query itself can be read,
+    so callables must eager-load everything the caller uses.
+
+    Args:
+        *queries: Zero-argument callables, each running one query
+
+    Returns:
+        List of the callables' results, in the order given
+    """
+    app = current_app._get_current_object()
+
+    def run(query):
+        with app.app_context():
+            return query()
+
+    futures = [_executor.submit(run, query) for query in queries]
+    return [future.result() for future in futures]
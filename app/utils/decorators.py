@@ -8,6 +8,8 @@ import time
 from datetime import datetime, timedelta, timezone
 from flask import request, jsonify, current_app, g
 from flask_jwt_extended import get_jwt_identity, verify_jwt_in_request
+from sqlalchemy.orm import load_only
+from app.utils.enterprise_cache import get_enterprise
 
 # Redis client for rate limiting (assuming Redis is configured in app)
 try:
@@ -32,6 +34,9 @@ except ImportError:
                 'expires': time.time() + ex
             }
             
+        def delete(self, key):
+            self.cache.pop(key, None)
+            
         def incr(self, key):
             value = self.get(key) or 0
             value += 1
@@ -68,13 +73,50 @@ def role_required(*roles):
         return wrapper
     return decorator
 
+def user_required(fn):
+    """
+    Decorator requiring a signed-in user.
+    Loads the caller's User into g.user once per request, answering 403 for
+    non-user tokens and 404 if the user no longer exists. Only the commonly read columns are selected; others
+    load on first access. Session.get goes through the identity map, so
+    handlers calling other decorated handlers reuse the same object.
+    """
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        from app import db
+        from app.models import User
+        
+        verify_jwt_in_request()
+        current_user = get_jwt_identity()
+        
+        # Enterprise ids overlap user ids; only user tokens may load a User
+        if not current_user or current_user.get('type') != 'user':
+            return jsonify({"message": "Access denied: insufficient permissions"}), 403
+        
+        g.current_user = current_user
+        g.user = db.session.get(
+            User, g.current_user['id'],
+            options=[load_only(User.id, User.name, User.email, User.cv_path)]
+        )
+        if g.user is None:
+            return jsonify({"error": "User not found"}), 404
+        
+        return fn(*args, **kwargs)
+    return wrapper
+
 def enterprise_required(fn):
     """
     Shorthand decorator requiring enterprise role.
+    Loads the caller's enterprise (through the Redis enterprise cache) into
+    g.enterprise, answering 404 if it no longer exists.
     """
     @functools.wraps(fn)
     @role_required('enterprise')
     def wrapper(*args, **kwargs):
+        g.enterprise = get_enterprise(g.current_user['id'])
+        if g.enterprise is None:
+            return jsonify({"error": "Enterprise not found"}), 404
+        
         return fn(*args, **kwargs)
     return wrapper
 
@@ -150,6 +192,17 @@ def rate_limit(limit=100, period=60, by="ip"):
         return wrapper
     return decorator
 
+def get_request_data():
+    """
+    Parse the request body once, based on its mimetype.
+    
+    Returns:
+        Dictionary with the JSON body or the form fields (empty if neither)
+    """
+    if request.is_json:
+        return request.get_json(silent=True) or {}
+    return request.form.to_dict()
+
 def validate_request(schema):
     """
     Validate request data against a schema.
@@ -161,12 +214,7 @@ def validate_request(schema):
     def decorator(fn):
         @functools.wraps(fn)
         def wrapper(*args, **kwargs):
-            if request.is_json:
-                data = request.get_json()
-            elif request.form:
-                data = request.form.to_dict()
-            else:
-                data = {}
+            data = get_request_data()
             
             errors = {}
             
@@ -222,12 +270,19 @@ def validate_request(schema):
         return wrapper
     return decorator
 
-def cache_response(timeout=300):
+def cache_response(timeout=300, key_prefix=None, mimetype='application/json'):
     """
     Cache decorator for API responses.
     
+    Cached responses carry an ETag, so clients sending If-None-Match get a 304.
+    
     Args:
         timeout: Cache timeout in seconds
+        key_prefix: Optional string or callable returning the cache key, for
+                    per-user responses (e.g. lambda: f"rm:{get_jwt_identity()}").
+                    Defaults to the request path and query string.
+        mimetype: Mimetype of the responses to cache; 'text/html' caches
+                  views returning render_template() output
     """
     def decorator(fn):
         @functools.wraps(fn)
@@ -237,35 +292,48 @@ def cache_response(timeout=300):
                 return fn(*args, **kwargs)
                 
             # Create a cache key from the request
-            key = f"cache:{request.path}:{request.query_string.decode('utf-8')}"
+            if key_prefix is None:
+                key = f"cache:{request.path}:{request.query_string.decode('utf-8')}"
+            else:
+                key = f"cache:{key_prefix() if callable(key_prefix) else key_prefix}"
             
             # Try to get response from cache
             cached = redis_client.get(key)
             if cached:
-                response_data = json.loads(cached)
-                return jsonify(response_data)
+                response = current_app.response_class(cached, mimetype=mimetype)
+                response.add_etag()
+                return response.make_conditional(request)
                 
             # Generate the response
             response = fn(*args, **kwargs)
+            if isinstance(response, str):
+                # Rendered template
+                response = current_app.make_response(response)
             
-            # Cache successful JSON responses
+            # Cache successful responses
             if isinstance(response, tuple):
                 resp_obj, status_code = response
                 if status_code == 200 and isinstance(resp_obj, dict):
                     redis_client.set(key, json.dumps(resp_obj), ex=timeout)
-            else:
-                # For direct responses
-                try:
-                    data = response.get_json()
-                    redis_client.set(key, json.dumps(data), ex=timeout)
-                except Exception:
-                    # Not a JSON response, don't cache
-                    pass
+            elif getattr(response, 'mimetype', None) == mimetype and response.status_code == 200:
+                # For direct responses, store the serialized body as-is
+                redis_client.set(key, response.get_data(), ex=timeout)
+                response.add_etag()
+                return response.make_conditional(request)
                     
             return response
         return wrapper
     return decorator
 
+def invalidate_cache(key_prefix):
+    """
+    Drop a response cached by cache_response under the given key_prefix.
+    
+    Args:
+        key_prefix: The key the response was cached under
+    """
+    redis_client.delete(f"cache:{key_prefix}")
+
 def track_activity(activity_type):
     """
     Track user activity for analytics.
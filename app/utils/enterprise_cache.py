@@ -0,0 +1,113 @@
+"""
+Enterprise lookup cache for the Automated HR application.
+Keeps each enterprise's columns in a Redis hash so enterprise views skip the per-request SELECT.
+"""
+import json
+from datetime import datetime
+from types import SimpleNamespace
+from sqlalchemy import inspect, select, bindparam, lambda_stmt, DateTime
+from app import db, redis_client
+from app.models import Enterprise
+
+ENTERPRISE_CACHE_TIMEOUT = 300
+
+# Credentials never leave the database
+_EXCLUDED_COLUMNS = frozenset({'password_hash'})
+
+# Built once; later executions reuse the cached SQL instead of rebuilding the SELECT
+_enterprise_by_id = lambda_stmt(
+    lambda: select(Enterprise).where(Enterprise.id == bindparam('enterprise_id'))
+)
+
+
+def _cache_key(enterprise_id):
+    return f"ent:{enterprise_id}"
+
+
+def _cached_columns():
+    """Return (key, is_datetime) for every Enterprise column stored in the hash."""
+    return [
+        (column.key, isinstance(column.type, DateTime))
+        for column in inspect(Enterprise).columns
+        if column.key not in _EXCLUDED_COLUMNS
+    ]
+
+
+def _encode(value):
+    return json.dumps(value.isoformat() if isinstance(value, datetime) else value)
+
+
+def _decode(raw, is_datetime):
+    value = json.loads(raw)
+    if is_datetime and value is not None:
+        return datetime.fromisoformat(value)
+    return value
+
+
+def load_enterprise(enterprise_id):
+    """
+    Load the Enterprise ORM object, bypassing the cache.
+
+    Args:
+        enterprise_id: ID of the enterprise
+
+    Returns:
+        The Enterprise, or None if it does not exist
+    """
+    return db.session.execute(
+        _enterprise_by_id, {'enterprise_id': enterprise_id}
+    ).scalar_one_or_none()
+
+
+def get_enterprise(enterprise_id, *fields):
+    """
+    Look up an enterprise, serving it from Redis when cached.
+
+    The result is a read-only record with the enterprise's columns as
+    attributes (the password hash is never cached). Views that modify the
+    enterprise must use load_enterprise() instead and call
+    invalidate_enterprise() after committing.
+
+    Args:
+        enterprise_id: ID of the enterprise
+        *fields: Column names to read; all cached columns when omitted
+
+    Returns:
+        SimpleNamespace with the requested columns, or None if the
+        enterprise does not exist
+    """
+    columns = _cached_columns()
+    if fields:
+        columns = [(key, is_datetime) for key, is_datetime in columns if key in fields]
+    key = _cache_key(enterprise_id)
+
+    # HMGET only the needed fields; all None means the hash is missing or expired
+    raw_values = redis_client.hmget(key, [name for name, _ in columns])
+    if all(raw is not None for raw in raw_values):
+        return SimpleNamespace(**{
+            name: _decode(raw, is_datetime)
+            for (name, is_datetime), raw in zip(columns, raw_values)
+        })
+
+    enterprise = load_enterprise(enterprise_id)
+    if enterprise is None:
+        return None
+
+    pipe = redis_client.pipeline()
+    pipe.hset(key, mapping={
+        name: _encode(getattr(enterprise, name)) for name, _ in _cached_columns()
+    })
+    pipe.expire(key, ENTERPRISE_CACHE_TIMEOUT)
+    pipe.execute()
+
+    return SimpleNamespace(**{name: getattr(enterprise, name) for name, _ in columns})
+
+
+def invalidate_enterprise(enterprise_id):
+    """
+    Drop an enterprise's cached record after it has been modified.
+
+    Args:
+        enterprise_id: ID of the enterprise
+    """
+    redis_client.delete(_cache_key(enterprise_id))
@@ -4,6 +4,9 @@ Utility functions for handling file uploads, primarily CV parsing and processing
 
 import os
 import uuid
+import copy
+import functools
+import hashlib
 import fitz  # PyMuPDF
 from datetime import datetime
 from flask import current_app
@@ -281,4 +284,48 @@ def parse_cv(file_path):
         'skills': skills,
         'education': education,
         'experience': experience
-    }
\ No newline at end of file
+    }
+
+@functools.lru_cache(maxsize=128)
+def _parse_cv_fingerprinted(file_path, mtime, size):
+    return parse_cv(file_path)
+
+def parse_cv_cached(file_path):
+    """
+    Parse a CV, reusing the previous result while the file is unchanged.
+    
+    Results are keyed on (path, mtime, size), so re-uploading or
+    overwriting the CV invalidates the entry automatically.
+    
+    Args:
+        file_path: Path to the CV file
+        
+    Returns:
+        Dictionary with extracted information (a copy, safe to mutate)
+    """
+    stat = os.stat(file_path)
+    return copy.deepcopy(_parse_cv_fingerprinted(file_path, stat.st_mtime_ns, stat.st_size))
+
+@functools.lru_cache(maxsize=256)
+def _file_sha256(file_path, mtime, size):
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(65536), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def cv_fingerprint(file_path):
+    """
+    Hash a CV's contents, e.g. to tell whether data derived from it is stale.
+    
+    The hash is only recomputed when the file's mtime or size changes, so
+    repeated checks cost a stat().
+    
+    Args:
+        file_path: Path to the CV file
+        
+    Returns:
+        Hex sha256 of the file contents
+    """
+    stat = os.stat(file_path)
+    return _file_sha256(file_path, stat.st_mtime_ns, stat.st_size)
@@ -0,0 +1,74 @@
+"""
+Declarative loader options for the Automated HR application.
+Turns a field selector such as "{ id score created_at job { title } }" into
+load_only/selectinload options so list views fetch only the columns they show.
+"""
+import functools
+from sqlalchemy import inspect
+from sqlalchemy.orm import load_only, selectinload
+
+
+def _parse(tokens):
+    """Parse tokens after an opening brace into a list of (name, children) pairs."""
+    fields = []
+    while tokens:
+        token = tokens.pop(0)
+        if token == '}':
+            return fields
+        if token == '{':
+            if not fields:
+                raise ValueError("Field selector has a nested block without a field name")
+            name, _ = fields.pop()
+            fields.append((name, _parse(tokens)))
+        else:
+            fields.append((token, None))
+    raise ValueError("Field selector is missing a closing brace")
+
+
+def _build(model, fields):
+    """Build options relative to model for the parsed fields."""
+    mapper = inspect(model)
+    columns = []
+    relationships = []
+    for name, children in fields:
+        if name in mapper.relationships:
+            relationship = mapper.relationships[name]
+            # Keep the local foreign key loaded, or every row would fetch it separately
+            columns.extend(getattr(model, column.key) for column in relationship.local_columns
+                           if column.key in mapper.columns)
+            relationships.append((getattr(model, name), relationship.mapper.class_, children or []))
+        else:
+            columns.append(getattr(model, name))
+
+    options = [load_only(*columns)] if columns else []
+    for attribute, target, children in relationships:
+        loader = selectinload(attribute)
+        child_options = _build(target, children)
+        options.append(loader.options(*child_options) if child_options else loader)
+    return options
+
+
+@functools.lru_cache(maxsize=64)
+def _cached_options(model, spec):
+    tokens = spec.replace('{', ' { ').replace('}', ' } ').split()
+    if not tokens or tokens.pop(0) != '{':
+        raise ValueError("Field selector must start with '{'")
+    return tuple(_build(model, _parse(tokens)))
+
+
+def loader_options(model, spec):
+    """
+    Build loader options from a field selector.
+
+    Plain names become load_only() columns (the primary key is always
+    included); a name followed by a block is a relationship loaded with
+    selectinload() and its own column selection.
+
+    Args:
+        model: The mapped class the query returns
+        spec: Field selector, e.g. "{ id score created_at job { title } }"
+
+    Returns:
+        Tuple of loader options to pass to Query.options()
+    """
+    return _cached_options(model, spec)
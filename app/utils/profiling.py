@@ -0,0 +1,102 @@
+"""
+Request profiling for the Automated HR application.
+Enabled with the PROFILE config flag to find which routes are actually slow.
+"""
+import os
+import time
+from flask import g, request, has_request_context
+from sqlalchemy import event
+from werkzeug.middleware.profiler import ProfilerMiddleware
+
+
+def _count_queries(app, engine, is_profiled):
+    """Tally SQL statements and their time per request, reported in logs and a Server-Timing header."""
+
+    @event.listens_for(engine, 'before_cursor_execute')
+    def start_query_timer(conn, cursor, statement, parameters, context, executemany):
+        context._profile_start = time.perf_counter()
+
+    @event.listens_for(engine, 'after_cursor_execute')
+    def record_query(conn, cursor, statement, parameters, context, executemany):
+        # Queries from Celery or run_concurrently threads have no request to charge
+        if not has_request_context():
+            return
+        g.sql_queries = g.get('sql_queries', 0) + 1
+        g.sql_ms = g.get('sql_ms', 0.0) + (time.perf_counter() - context._profile_start) * 1000
+
+    @app.after_request
+    def report_queries(response):
+        if not is_profiled(request.path):
+            return response
+        queries = g.get('sql_queries', 0)
+        sql_ms = g.get('sql_ms', 0.0)
+        response.headers.add('Server-Timing', f'db;dur={sql_ms:.1f};desc="{queries} queries"')
+        app.logger.info(f"{request.method} {request.path}: {queries} queries, {sql_ms:.1f}ms in SQL")
+        return response
+
+
+def init_profiler(app):
+    """
+    Profile every request handled by the app.
+
+    werkzeug's ProfilerMiddleware writes a cProfile dump per request to
+    PROFILE_DIR and prints its 30 most expensive functions. If pyinstrument
+    is installed, requests slower than PROFILE_SLOW_MS also get an HTML
+    flamegraph there. Each profiled request also logs its SQL query count
+    and time.
+
+    Set PROFILE_PATHS (e.g. ('/interview',)) to profile only requests
+    whose path starts with one of the prefixes.
+
+    Args:
+        app: The Flask application
+    """
+    from app import db
+
+    profile_dir = app.config.get('PROFILE_DIR', 'profiles')
+    slow_ms = app.config.get('PROFILE_SLOW_MS', 200)
+    prefixes = tuple(app.config.get('PROFILE_PATHS') or ())
+    os.makedirs(profile_dir, exist_ok=True)
+
+    def is_profiled(path):
+        return not prefixes or path.startswith(prefixes)
+
+    plain_app = app.wsgi_app
+    profiled_app = ProfilerMiddleware(plain_app, restrictions=[30], profile_dir=profile_dir)
+
+    def wsgi_app(environ, start_response):
+        if is_profiled(environ.get('PATH_INFO', '')):
+            return profiled_app(environ, start_response)
+        return plain_app(environ, start_response)
+
+    app.wsgi_app = wsgi_app
+
+    with app.app_context():
+        _count_queries(app, db.engine, is_profiled)
+
+    try:
+        from pyinstrument import Profiler
+    except ImportError:
+        app.logger.warning("pyinstrument not installed: only cProfile dumps will be written")
+        return
+
+    @app.before_request
+    def start_profiler():
+        if is_profiled(request.path):
+            g.profiler = Profiler()
+            g.profiler.start()
+
+    @app.after_request
+    def save_slow_profile(response):
+        profiler = g.pop('profiler', None)
+        if profiler is None:
+            return response
+
+        session = profiler.stop()
+        duration_ms = session.duration * 1000
+        if duration_ms >= slow_ms:
+            route = request.path.strip('/').replace('/', '.') or 'root'
+            filename = f"{request.method}.{route}.{duration_ms:.0f}ms.{time.time():.0f}.html"
+            with open(os.path.join(profile_dir, filename), 'w') as f:
+                f.write(profiler.output_html())
+        return response
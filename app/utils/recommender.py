@@ -3,20 +3,98 @@ Recommender utility for the Automated HR system.
 Handles job-candidate matching, skill gap analysis, and career path recommendations.
 """
 import logging
-from sqlalchemy import func, desc
+import threading
+import time
+from collections import namedtuple
+import numpy as np
+from sqlalchemy import func, desc, select
 from app.models import User, Job, Application, Interview, CareerRoadmap
+from app.utils.skills import normalize_skills
 from app import db
 
 logger = logging.getLogger(__name__)
 
+try:
+    import numba
+    _NUMBA_AVAILABLE = True
+except ImportError:
+    _NUMBA_AVAILABLE = False
+
+# Active-job skill matrix, rebuilt at most this often per process
+JOB_INDEX_TTL = 300
+
+_JobIndex = namedtuple('_JobIndex', 'job_ids titles vocabulary job_skills job_skill_counts built_at')
+_job_index = None
+_job_index_lock = threading.Lock()
+
+
+def _build_job_index():
+    """Load active jobs' skill tokens into a (jobs x skills) 0/1 matrix."""
+    rows = db.session.execute(
+        select(Job.id, Job.title, Job.skills_required_tokens).where(Job.status == 'active')
+    ).all()
+    
+    vocabulary = {}
+    for row in rows:
+        for skill in row.skills_required_tokens or ():
+            vocabulary.setdefault(skill, len(vocabulary))
+    
+    job_skills = np.zeros((len(rows), max(len(vocabulary), 1)), dtype=np.uint8)
+    for i, row in enumerate(rows):
+        for skill in row.skills_required_tokens or ():
+            job_skills[i, vocabulary[skill]] = 1
+    
+    return _JobIndex(
+        job_ids=np.array([row.id for row in rows], dtype=np.int64),
+        titles=np.array([row.title.lower() for row in rows], dtype=str),
+        vocabulary=vocabulary,
+        job_skills=job_skills,
+        job_skill_counts=job_skills.sum(axis=1, dtype=np.int32),
+        built_at=time.monotonic()
+    )
+
+
+def _get_job_index():
+    """Return the cached job index, rebuilding it once it is older than JOB_INDEX_TTL."""
+    global _job_index
+    index = _job_index
+    if index is None or time.monotonic() - index.built_at > JOB_INDEX_TTL:
+        with _job_index_lock:
+            if _job_index is None or time.monotonic() - _job_index.built_at > JOB_INDEX_TTL:
+                _job_index = _build_job_index()
+            index = _job_index
+    return index
+
+
+if _NUMBA_AVAILABLE:
+    @numba.njit(cache=True, parallel=True)
+    def _skill_overlap(job_skills, user_columns, job_skill_counts):
+        """Share of each job's skills found in user_columns, one job per parallel iteration."""
+        scores = np.zeros(job_skills.shape[0], dtype=np.float64)
+        for i in numba.prange(job_skills.shape[0]):
+            if job_skill_counts[i] == 0:
+                continue
+            matched = 0
+            for column in user_columns:
+                matched += job_skills[i, column]
+            scores[i] = matched / job_skill_counts[i]
+        return scores
+else:
+    def _skill_overlap(job_skills, user_columns, job_skill_counts):
+        """Share of each job's skills found in user_columns (NumPy fallback when numba is missing)."""
+        matched = job_skills[:, user_columns].sum(axis=1, dtype=np.int32)
+        return matched / np.maximum(job_skill_counts, 1)
+
+
 class RecommenderSystem:
     @staticmethod
-    def recommend_jobs_for_user(user_id, limit=10):
+    def recommend_jobs_for_user(user_id, user_skills=None, limit=10):
         """
         Recommends jobs based on user's skills and career goals.
         
         Args:
             user_id: The ID of the user to recommend jobs for
+            user_skills: Skills to match on; the profile's skills when None
             limit: Maximum number of recommendations to return
             
         Returns:
@@ -25,13 +103,15 @@ class RecommenderSystem:
         try:
             # Get user profile and extracted skills
             user = User.query.get(user_id)
-            if not user or not user.profile_data:
+            if not user or (user_skills is None and not user.profile_data):
                 logger.warning(f"User {user_id} not found or has no profile data")
                 return []
             
             # Extract user skills and preferences from profile data
-            user_skills = set(user.profile_data.get('skills', []))
-            preferred_roles = set(user.profile_data.get('preferred_roles', []))
+            profile_data = user.profile_data or {}
+            if user_skills is None:
+                user_skills = profile_data.get('skills', [])
+            preferred_roles = set(profile_data.get('preferred_roles', []))
             
             # Get user's career roadmap if available
             roadmap = CareerRoadmap.query.filter_by(user_id=user_id).first()
@@ -39,28 +119,36 @@ class RecommenderSystem:
             if roadmap and roadmap.goals:
                 target_roles = set(roadmap.goals.get('target_roles', []))
             
-            # Find jobs that match user skills and preferences
-            matching_jobs = Job.query.filter(Job.active == True).all()
-            
-            # Score each job based on skill match and role match
-            scored_jobs = []
-            for job in matching_jobs:
-                job_skills = set(job.skills_required)
-                skill_match_score = len(user_skills.intersection(job_skills)) / max(len(job_skills), 1)
-                
-                # Role matching
-                role_match = 0
-                if job.title.lower() in [role.lower() for role in preferred_roles.union(target_roles)]:
-                    role_match = 1
-                    
-                # Combined score (70% skill match, 30% role preference)
-                final_score = (skill_match_score * 0.7) + (role_match * 0.3)
-                
-                scored_jobs.append((job, final_score))
+            index = _get_job_index()
+            if not index.job_ids.size:
+                return []
             
-            # Sort by score and return top recommendations
-            scored_jobs.sort(key=lambda x: x[1], reverse=True)
-            return [job for job, score in scored_jobs[:limit]]
+            # Skill match: share of each job's required skills the user has, all jobs at once
+            user_columns = np.array(
+                sorted({index.vocabulary[skill] for skill in normalize_skills(user_skills)
+                        if skill in index.vocabulary}),
+                dtype=np.int64
+            )
+            skill_match_scores = _skill_overlap(index.job_skills, user_columns, index.job_skill_counts)
+            
+            # Role matching
+            roles = [role.lower() for role in preferred_roles.union(target_roles)]
+            role_match = np.isin(index.titles, roles) if roles else np.zeros(index.job_ids.size, dtype=bool)
+            
+            # Combined score (70% skill match, 30% role preference)
+            final_scores = skill_match_scores * 0.7 + role_match * 0.3
+            
+            # Top `limit` without sorting every job
+            top = min(limit, final_scores.size)
+            best = np.argpartition(-final_scores, top - 1)[:top]
+            best = best[np.argsort(-final_scores[best], kind='stable')]
+            top_ids = [int(job_id) for job_id in index.job_ids[best]]
+            
+            # The index may be up to JOB_INDEX_TTL old; skip jobs closed since it was built
+            jobs_by_id = {job.id: job for job in Job.query.filter(
+                Job.id.in_(top_ids), Job.status == 'active'
+            ).all()}
+            return [jobs_by_id[job_id] for job_id in top_ids if job_id in jobs_by_id]
             
         except Exception as e:
             logger.error(f"Error in job recommendation: {str(e)}")
@@ -84,7 +172,7 @@ class RecommenderSystem:
                 logger.warning(f"Job {job_id} not found")
                 return []
             
-            job_skills = set(job.skills_required)
+            job_skills = set(job.skills_required_tokens or [])
             
             # Get all users who have not already applied
             existing_applicants = db.session.query(Application.user_id).filter_by(job_id=job_id).all()
@@ -101,7 +189,7 @@ class RecommenderSystem:
                 if not candidate.profile_data or 'skills' not in candidate.profile_data:
                     continue
                     
-                user_skills = set(candidate.profile_data.get('skills', []))
+                user_skills = set(normalize_skills(candidate.profile_data.get('skills', [])))
                 skill_match_score = len(user_skills.intersection(job_skills)) / max(len(job_skills), 1)
                 
                 # Get average interview score for similar roles
@@ -147,14 +235,14 @@ class RecommenderSystem:
                 logger.warning(f"User {user_id} not found or has no profile data")
                 return {"missing_skills": [], "recommendations": []}
                 
-            user_skills = set(user.profile_data.get('skills', []))
+            user_skills = set(normalize_skills(user.profile_data.get('skills', [])))
             
             target_skills = set()
             # If job_id is provided, get skills from that job
             if job_id:
                 job = Job.query.get(job_id)
                 if job:
-                    target_skills = set(job.skills_required)
+                    target_skills = set(job.skills_required_tokens or [])
             
             # If target role is provided, get common skills for that role
             elif target_role:
@@ -165,7 +253,7 @@ class RecommenderSystem:
                 # Collect skills from similar roles
                 all_skills = []
                 for job in similar_jobs:
-                    all_skills.extend(job.skills_required)
+                    all_skills.extend(job.skills_required_tokens or [])
                 
                 # Get most common skills (appearing in at least 50% of similar jobs)
                 if all_skills:
@@ -0,0 +1,54 @@
+"""
+Password hashing helpers for the Automated HR application.
+New hashes use argon2id; legacy werkzeug (pbkdf2/scrypt) hashes are still accepted and upgraded on login.
+"""
+from argon2 import PasswordHasher
+from argon2.exceptions import VerificationError, InvalidHashError
+from werkzeug.security import check_password_hash
+
+_password_hasher = PasswordHasher(time_cost=2, memory_cost=64 * 1024, parallelism=1)
+ARGON2_PREFIX = '$argon2'
+
+
+def hash_password(password):
+    """
+    Hash a password with argon2id.
+
+    Args:
+        password: The plain-text password
+
+    Returns:
+        The encoded argon2 hash
+    """
+    return _password_hasher.hash(password)
+
+
+def verify_password(password_hash, password):
+    """
+    Check a password against a stored hash.
+
+    Args:
+        password_hash: The stored hash (argon2 or legacy werkzeug format)
+        password: The plain-text password to check
+
+    Returns:
+        Tuple of (is_valid, new_hash). new_hash is set when the password is
+        valid but the stored hash is legacy or uses outdated parameters, and
+        should replace it.
+    """
+    if not password_hash:
+        return False, None
+
+    if not password_hash.startswith(ARGON2_PREFIX):
+        if check_password_hash(password_hash, password):
+            return True, hash_password(password)
+        return False, None
+
+    try:
+        _password_hasher.verify(password_hash, password)
+    except (VerificationError, InvalidHashError):
+        return False, None
+
+    if _password_hasher.check_needs_rehash(password_hash):
+        return True, hash_password(password)
+    return True, None
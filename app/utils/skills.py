@@ -0,0 +1,24 @@
+"""
+Skill list normalization for the Automated HR application.
+Job requirements are tokenized once when saved, so matching compares ready-made token lists.
+"""
+import re
+
+_SEPARATORS = re.compile(r'[,;|\n]+')
+
+
+def normalize_skills(skills):
+    """
+    Turn a skills field into a sorted list of unique, lower-cased tokens.
+
+    Args:
+        skills: Comma/semicolon/newline separated string, or an iterable of skill names
+
+    Returns:
+        List of normalized skill tokens (empty if skills is empty)
+    """
+    if not skills:
+        return []
+    if isinstance(skills, str):
+        skills = _SEPARATORS.split(skills)
+    return sorted({' '.join(skill.split()).lower() for skill in skills if skill and skill.strip()})
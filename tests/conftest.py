@@ -0,0 +1,64 @@
+"""
+Shared fixtures for the Automated HR test suite.
+Tests run against the TestingConfig Postgres database; tables are created
+once per session and emptied after every test.
+"""
+import pytest
+
+from app import create_app, db as _db
+from app.models import User, Enterprise, Job
+
+
+@pytest.fixture(scope='session')
+def app():
+    app = create_app('testing')
+    with app.app_context():
+        _db.create_all()
+        yield app
+        _db.drop_all()
+
+
+@pytest.fixture
+def db(app):
+    yield _db
+    _db.session.rollback()
+    for table in reversed(_db.metadata.sorted_tables):
+        _db.session.execute(table.delete())
+    _db.session.commit()
+
+
+@pytest.fixture
+def client(app, db):
+    return app.test_client()
+
+
+@pytest.fixture
+def make_user(db):
+    def make(email, **fields):
+        user = User(name=email.split('@')[0], email=email, password_hash='unused', **fields)
+        db.session.add(user)
+        db.session.commit()
+        return user
+    return make
+
+
+@pytest.fixture
+def make_enterprise(db):
+    def make(email, **fields):
+        enterprise = Enterprise(name=email.split('@')[0], email=email, password_hash='unused', **fields)
+        db.session.add(enterprise)
+        db.session.commit()
+        return enterprise
+    return make
+
+
+@pytest.fixture
+def make_job(db):
+    def make(enterprise, **fields):
+        fields.setdefault('title', 'Backend developer')
+        fields.setdefault('description', 'Builds and runs the API')
+        job = Job(enterprise_id=enterprise.id, **fields)
+        db.session.add(job)
+        db.session.commit()
+        return job
+    return make
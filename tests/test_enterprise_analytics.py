@@ -0,0 +1,20 @@
+from app.models import Application, Interview
+from app.routes.entreprise import analytics_counts
+
+
+def test_analytics_counts_are_scoped_to_the_enterprise(db, make_user, make_enterprise, make_job):
+    own = make_enterprise('own@example.com')
+    other = make_enterprise('other@example.com')
+    candidate = make_user('candidate@example.com')
+
+    own_job = make_job(own)
+    other_jobs = [make_job(other), make_job(other)]
+    db.session.add_all([
+        Application(user_id=candidate.id, job_id=own_job.id),
+        *(Application(user_id=candidate.id, job_id=job.id) for job in other_jobs),
+        Interview(user_id=candidate.id, job_id=other_jobs[0].id),
+    ])
+    db.session.commit()
+
+    assert analytics_counts(own.id) == (1, 1, 0)
+    assert analytics_counts(other.id) == (2, 2, 1)
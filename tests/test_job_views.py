@@ -0,0 +1,45 @@
+from flask_jwt_extended import create_access_token
+
+from app.models import Application
+
+
+def _auth_headers(identity):
+    return {
+        'Authorization': f"Bearer {create_access_token(identity=identity)}",
+        'Accept': 'application/json',
+    }
+
+
+def test_view_job_as_guest(client, make_enterprise, make_job):
+    job = make_job(make_enterprise('acme@example.com'))
+
+    response = client.get(f'/api/job/{job.id}', headers={'Accept': 'application/json'})
+
+    assert response.status_code == 200
+    assert response.json['already_applied'] is False
+    assert response.json['user_match_score'] is None
+
+
+def test_view_job_as_signed_in_user(client, db, make_user, make_enterprise, make_job):
+    job = make_job(make_enterprise('acme@example.com'))
+    candidate = make_user('candidate@example.com')
+    db.session.add(Application(user_id=candidate.id, job_id=job.id))
+    db.session.commit()
+
+    response = client.get(f'/api/job/{job.id}', headers=_auth_headers({'id': candidate.id, 'type': 'user'}))
+
+    assert response.status_code == 200
+    assert response.json['already_applied'] is True
+
+
+def test_view_job_as_enterprise_is_not_treated_as_a_user(client, make_user, make_enterprise, make_job):
+    enterprise = make_enterprise('acme@example.com')
+    job = make_job(enterprise)
+    # A user sharing the enterprise's id must not be looked up
+    make_user('candidate@example.com')
+
+    response = client.get(f'/api/job/{job.id}', headers=_auth_headers({'id': enterprise.id, 'type': 'enterprise'}))
+
+    assert response.status_code == 200
+    assert response.json['already_applied'] is False
+    assert response.json['user_match_score'] is None